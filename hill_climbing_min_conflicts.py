@@ -0,0 +1,34 @@
+"""
+    Implementation of hill climbing search and its variants.
+    author: Jawad Chowdhury.
+"""
+from nqueen import NQueen
+
+if __name__ == "__main__":
+    print('Hill Climbing Search (min_conflicts)!!!')
+    input_file_name = 'input.txt'
+    with open(input_file_name) as f:
+        lines = f.readlines()
+        values = [line.replace('\n', '').replace(' ', '') for line in lines]
+        values = [int(v) for v in values]
+    n = values[0] # value of n
+    no_run = values[1] # value of number of runs.
+    nq_min_conflicts = NQueen(no_runs=no_run, n=n, variant='min_conflicts')
+    nq_min_conflicts.run()
+    print()
+    nr = nq_min_conflicts.no_runs
+    ns = nq_min_conflicts.no_success
+    rs = (ns/nr)*100
+    nf = nr-ns
+    rf = (nf/nr)*100
+    n_total_steps = nq_min_conflicts.no_total_steps
+    n_success_steps = nq_min_conflicts.no_success_steps
+    n_failure_steps = n_total_steps - n_success_steps
+    avg_steps_success = n_success_steps/ns if ns != 0 else 0
+    avg_steps_failure = n_failure_steps/nf if nf != 0 else 0
+    print('No of Total Runs: {:.2f}'.format(nr) )
+    print('Success Rate: {:.2f} %'.format(rs) )
+    print('Failure Rate: {:.2f} %'.format(rf) )
+    print('Avg steps at Success: {:.2f} '.format(avg_steps_success) )
+    print('Avg steps at Failure: {:.2f} '.format(avg_steps_failure) )
+
@@ -2,166 +2,19 @@
     Implementation of hill climbing search and its variants.
     author: Jawad Chowdhury.
 """
-import random, copy
-
-class Board:
-    """
-    This class maintains properties related to the different state of the N-Queen Problem.
-    """
-    def __init__(self, n, state=None):
-        self.n = n
-        if state==None:
-            self.state = [['_' for c in range(n)] for r in range(n)]
-            for q in range(n):
-                r, c = random.randint(0,n-1), random.randint(0,n-1)
-                while self.state[r][c] != '_':
-                    r, c = random.randint(0, n - 1), random.randint(0, n - 1)
-                self.state[r][c] = 'Q'
-        else:
-            self.state=state
-        self.hcost = self.get_hcost()
-    def get_hvcost(self):
-        hvcost = 0
-        for r in range(self.n):
-            for c in range(self.n):
-                if self.state[r][c] == 'Q':
-                    for t in range(self.n):
-                        if self.state[r][t] == "Q":
-                            hvcost += 1
-                        if self.state[t][c] == "Q":
-                            hvcost += 1
-                    hvcost = hvcost -2
-        hvcost = hvcost/2
-        return hvcost
-    def get_dcost(self):
-        dcost = 0
-        for r in range(self.n):
-            for c in range(self.n):
-                if self.state[r][c] == 'Q':
-                    tr, tc = r - 1, c - 1
-                    while tr >= 0 and tc >= 0:
-                        if self.state[tr][tc] == "Q":
-                            dcost += 1
-                        tr -= 1
-                        tc -= 1
-                    tr, tc = r + 1, c - 1
-                    while tr < self.n and tc >= 0:
-                        if self.state[tr][tc] == "Q":
-                            dcost += 1
-                        tr += 1
-                        tc -= 1
-                    tr, tc = r + 1, c + 1
-                    while tr < self.n and tc < self.n:
-                        if self.state[tr][tc] == "Q":
-                            dcost += 1
-                        tr += 1
-                        tc += 1
-                    tr, tc = r - 1, c + 1
-                    while tr >= 0 and tc < self.n:
-                        if self.state[tr][tc] == "Q":
-                            dcost += 1
-                        tr -= 1
-                        tc += 1
-        dcost = dcost/2
-        return dcost
-    def get_hcost(self):
-        """
-        This method is being used to calculate the heuristic cost of the current board.
-        :return:
-        """
-        hvcost = self.get_hvcost()
-        dcost = self.get_dcost()
-        hcost = hvcost + dcost
-        return hcost
-    def __str__(self):
-        """
-        String representation of the state.
-        :return:
-        """
-        s=''
-        for r in range(self.n):
-            for c in range(self.n):
-                s += str(self.state[r][c]) + ' '
-            s += '\n'
-        s += str('hcost') + ' : ' + str(self.hcost)
-        s += '\n'
-        return s
-
-class NQueen:
-    """
-    This class is being used to maintain the overall flow of the N-Queen problem.
-    """
-    def __init__(self, no_runs, n, variant='random_restart_basic'):
-        self.no_runs = no_runs
-        self.n = n
-        self.variant = variant
-        self.no_success = 0
-        self.no_total_steps = 0
-        self.no_random_restart = 0
-        self.no_success_steps = 0
-    def run(self):
-        for i in range(0, self.no_runs):
-            self.no_random_restart +=1
-            print()
-            print('==========     BOARD :%s    =========='%(i,) )
-            b = Board(n=n)
-            self.hill_climbing(variant=self.variant, board=b)
-    def get_best_neighbor(self, board):
-        """
-        This method gives the best successor based on the strategy.
-        :param board:
-        :return:
-        """
-        best_board = board
-        best_cost = board.hcost
-        for r in range(0,self.n):
-            for c in range(0,self.n):
-                if board.state[r][c] == 'Q':
-                    for nr in range(0,self.n):
-                        for nc in range(0,self.n):
-                            if board.state[nr][nc] == '_':
-                                neighbor_state = copy.deepcopy(board.state)
-                                neighbor_state[r][c] = '_'
-                                neighbor_state[nr][nc] = 'Q'
-                                neighbor = Board(n=self.n, state=neighbor_state)
-                                if neighbor.hcost < best_cost:
-                                    best_cost = neighbor.hcost
-                                    best_board = neighbor
-        return best_board, best_cost
-    def hill_climbing(self, variant='random_restart_basic', board=None):
-        """
-        This method runs the hill climbing algorithm based on the variant.
-        :param variant:
-        :param board:
-        :return:
-        """
-        if board and variant == 'random_restart_basic':
-            current_board = board
-            no_local_restart = 0
-            no_local_steps = 0
-            success = False
-            while not success:
-                while True:
-                    print(current_board)
-                    best_neighbor, _ = self.get_best_neighbor(current_board)
-                    if current_board.hcost == best_neighbor.hcost:
-                        break
-                    no_local_steps += 1
-                    current_board = best_neighbor
-                print(best_neighbor)
-                if best_neighbor.hcost == 0:
-                    success = True
-                    print('SOLUTION FOUND')
-                else:
-                    current_board = Board(n=self.n)
-                    no_local_restart += 1
-                    print('RESTARTING ...')
-            self.no_random_restart += no_local_restart
-            self.no_total_steps += no_local_steps
-            self.no_success += 1
-            self.no_success_steps += no_local_steps
+import argparse, sys
+from nqueen import NQueen, Checkpoint
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--checkpoint', help='file to checkpoint the progress to')
+    parser.add_argument('--checkpoint-every', type=float, default=60.0, help='seconds between checkpoints')
+    parser.add_argument('--resume', action='store_true', help='continue from the checkpoint file')
+    parser.add_argument('--portfolio', type=int, metavar='K',
+                        help='solve a single board with K restart chains in parallel, the first solver wins')
+    parser.add_argument('--seed', type=int, help='master seed of the runs or of the portfolio chains')
+    args = parser.parse_args()
+    checkpoint = Checkpoint(args.checkpoint, every=args.checkpoint_every) if args.checkpoint else None
     print('Hill Climbing Search ( random_restart_basic)!!!')
     input_file_name = 'input.txt'
     with open(input_file_name) as f:
@@ -170,8 +23,16 @@ if __name__ == "__main__":
         values = [int(v) for v in values]
     n = values[0] # value of n
     no_run = values[1] # value of number of runs.
-    nq_random_restart_basic = NQueen(no_runs=no_run, n=n, variant='random_restart_basic')
-    nq_random_restart_basic.run()
+    if args.portfolio:
+        nq_portfolio = NQueen(no_runs=1, n=n, variant='random_restart_basic', seed=args.seed)
+        result = nq_portfolio.run_portfolio(args.portfolio)
+        print('Wall time: {:.3f} s'.format(result['wall_time']))
+        print('Winning chain: {}'.format(result['winning_chain']))
+        print('Total steps: {}'.format(result['total_steps']))
+        print('Total random restart: {}'.format(result['total_restarts']))
+        sys.exit()
+    nq_random_restart_basic = NQueen(no_runs=no_run, n=n, variant='random_restart_basic', seed=args.seed)
+    nq_random_restart_basic.run(checkpoint=checkpoint, resume=args.resume)
     print()
     nr = nq_random_restart_basic.no_runs
     ns = nq_random_restart_basic.no_success
@@ -188,7 +49,8 @@ if __name__ == "__main__":
     # print('Failure Rate: {:.2f} %'.format(rf) )
     # print('Avg steps at Success: {:.2f} '.format(avg_steps_success) )
     # print('Avg steps at Failure: {:.2f} '.format(avg_steps_failure) )
-    n_random_restart = nq_random_restart_basic.no_random_restart
+    # the report counts the first random board of every run as a restart too
+    n_random_restart = nq_random_restart_basic.no_random_restart + nr
     avg_random_restart = n_random_restart/nr if nr != 0 else 0
     avg_steps = n_total_steps/nr if nr != 0 else 0
     print('Avg random restart: {:.2f} '.format(avg_random_restart) )
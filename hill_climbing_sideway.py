@@ -2,198 +2,15 @@
     Implementation of hill climbing search and its variants.
     author: Jawad Chowdhury.
 """
-import random, copy
-
-class Board:
-    """
-    This class maintains properties related to the different state of the N-Queen Problem.
-    """
-    def __init__(self, n, state=None):
-        self.n = n
-        if state==None:
-            self.state = [['_' for c in range(n)] for r in range(n)]
-            for q in range(n):
-                r, c = random.randint(0,n-1), random.randint(0,n-1)
-                while self.state[r][c] != '_':
-                    r, c = random.randint(0, n - 1), random.randint(0, n - 1)
-                self.state[r][c] = 'Q'
-        else:
-            self.state=state
-        self.hcost = self.get_hcost()
-    def get_hvcost(self):
-        hvcost = 0
-        for r in range(self.n):
-            for c in range(self.n):
-                if self.state[r][c] == 'Q':
-                    for t in range(self.n):
-                        if self.state[r][t] == "Q":
-                            hvcost += 1
-                        if self.state[t][c] == "Q":
-                            hvcost += 1
-                    hvcost = hvcost -2
-        hvcost = hvcost/2
-        return hvcost
-    def get_dcost(self):
-        dcost = 0
-        for r in range(self.n):
-            for c in range(self.n):
-                if self.state[r][c] == 'Q':
-                    tr, tc = r - 1, c - 1
-                    while tr >= 0 and tc >= 0:
-                        if self.state[tr][tc] == "Q":
-                            dcost += 1
-                        tr -= 1
-                        tc -= 1
-                    tr, tc = r + 1, c - 1
-                    while tr < self.n and tc >= 0:
-                        if self.state[tr][tc] == "Q":
-                            dcost += 1
-                        tr += 1
-                        tc -= 1
-                    tr, tc = r + 1, c + 1
-                    while tr < self.n and tc < self.n:
-                        if self.state[tr][tc] == "Q":
-                            dcost += 1
-                        tr += 1
-                        tc += 1
-                    tr, tc = r - 1, c + 1
-                    while tr >= 0 and tc < self.n:
-                        if self.state[tr][tc] == "Q":
-                            dcost += 1
-                        tr -= 1
-                        tc += 1
-        dcost = dcost/2
-        return dcost
-    def get_hcost(self):
-        """
-        This method is being used to calculate the heuristic cost of the current board.
-        :return:
-        """
-        hvcost = self.get_hvcost()
-        dcost = self.get_dcost()
-        hcost = hvcost + dcost
-        return hcost
-    def __str__(self):
-        """
-        String representation of the state.
-        :return:
-        """
-        s=''
-        for r in range(self.n):
-            for c in range(self.n):
-                s += str(self.state[r][c]) + ' '
-            s += '\n'
-        s += str('hcost') + ' : ' + str(self.hcost)
-        s += '\n'
-        return s
-
-class NQueen:
-    """
-    This class is being used to maintain the overall flow of the N-Queen problem.
-    """
-    def __init__(self, no_runs, n, variant='sideway'):
-        self.no_runs = no_runs
-        self.n = n
-        self.variant = variant
-        self.no_success = 0
-        self.no_total_steps = 0
-        self.no_success_steps = 0
-    def run(self, limit_sideway=100):
-        for i in range(0, self.no_runs):
-            print()
-            print('==========     BOARD :%s    =========='%(i,) )
-            b = Board(n=n)
-            self.hill_climbing(variant=self.variant, board=b, limit_sideway=limit_sideway)
-    def get_best_neighbor(self, board, allow_sideway=False):
-        """
-        This method gives the best successor based on the strategy.
-        :param board:
-        :return:
-        """
-        u=False
-        best_board = board
-        best_cost = board.hcost
-        if allow_sideway:
-            list_indexQ = []
-            list_indexBlank = []
-            for r in range(0,self.n):
-                for c in range(0,self.n):
-                    index = (r, c)
-                    if board.state[r][c] == 'Q':
-                        list_indexQ.append(index)
-                    else:
-                        list_indexBlank.append(index)
-            random.shuffle(list_indexQ)
-            random.shuffle(list_indexBlank)
-            for (r,c) in list_indexQ:
-                if board.state[r][c] == 'Q':
-                    for (nr,nc) in list_indexBlank:
-                        if board.state[nr][nc] == '_':
-                            neighbor_state = copy.deepcopy(board.state)
-                            neighbor_state[r][c] = '_'
-                            neighbor_state[nr][nc] = 'Q'
-                            neighbor = Board(n=self.n, state=neighbor_state)
-                            if neighbor.hcost <= best_cost:
-                                u=True
-                                best_cost = neighbor.hcost
-                                best_board = neighbor
-        else:
-            for r in range(0,self.n):
-                for c in range(0,self.n):
-                    if board.state[r][c] == 'Q':
-                        for nr in range(0,self.n):
-                            for nc in range(0,self.n):
-                                if board.state[nr][nc] == '_':
-                                    neighbor_state = copy.deepcopy(board.state)
-                                    neighbor_state[r][c] = '_'
-                                    neighbor_state[nr][nc] = 'Q'
-                                    neighbor = Board(n=self.n, state=neighbor_state)
-                                    if neighbor.hcost < best_cost:
-                                        u=True
-                                        best_cost = neighbor.hcost
-                                        best_board = neighbor
-        return best_board, u
-    def hill_climbing(self, variant='sideway', board=None, limit_sideway=100):
-        """
-        This method runs the hill climbing algorithm based on the variant.
-        :param variant:
-        :param board:
-        :return:
-        """
-        if board and variant == 'sideway':
-            current_board = board
-            no_local_steps = 0
-            while current_board.hcost != 0:
-                print(current_board)
-                best_neighbor, _ = self.get_best_neighbor(current_board, allow_sideway=False)
-                if best_neighbor.hcost < current_board.hcost:
-                    current_board = best_neighbor
-                    no_local_steps += 1
-                else:
-                    counter_sideway = 0
-                    updated = True
-                    while (best_neighbor.hcost >= current_board.hcost) and counter_sideway <=limit_sideway:
-                        print(current_board)
-                        current_board = best_neighbor
-                        no_local_steps += 1
-                        counter_sideway +=1
-                        best_neighbor, updated = self.get_best_neighbor(current_board, allow_sideway=True)
-                        if not updated:
-                            break
-                    if counter_sideway > limit_sideway or not updated:
-                        break
-                    current_board = best_neighbor
-            print(current_board)
-            if current_board.hcost != 0:
-                print('SOLUTION NOT FOUND!!!')
-                self.no_total_steps += no_local_steps
-            else:
-                print ('SOLUTION FOUND!!!')
-                self.no_success += 1
-                self.no_success_steps += no_local_steps
-                self.no_total_steps += no_local_steps
+import argparse
+from nqueen import NQueen
+from nqueen.budget import parse_limit
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--limit', type=parse_limit, default=100,
+                        help="sideways limit, or 'adaptive' to learn it from the plateaus (default: 100)")
+    args = parser.parse_args()
     print('Hill Climbing Search (sideway)!!!')
     input_file_name = 'input.txt'
     with open(input_file_name) as f:
@@ -203,7 +20,7 @@ if __name__ == "__main__":
     n = values[0] # value of n
     no_run = values[1] # value of number of runs.
     nq_sideway = NQueen(no_runs=no_run, n=n, variant='sideway')
-    nq_sideway.run(limit_sideway=100)
+    nq_sideway.run(limit_sideway=args.limit)
     print()
     nr = nq_sideway.no_runs
     ns = nq_sideway.no_success
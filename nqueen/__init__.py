@@ -0,0 +1,12 @@
+"""
+    Hill climbing search and its variants for the N-Queen problem.
+    author: Jawad Chowdhury.
+"""
+from nqueen.board import Board, PermutationBoard, BOARD_MODELS
+from nqueen.budget import SidewayBudget
+from nqueen.cache import CostCache
+from nqueen.checkpoint import Checkpoint
+from nqueen.results import JsonlSink, RunStats, RunningStats, read_jsonl
+from nqueen.variants import VARIANTS, register_variant, get_variant
+from nqueen.search import NQueen, run_board, run_chain
+from nqueen.batch import BatchNQueen
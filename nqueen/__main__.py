@@ -0,0 +1,7 @@
+"""
+    Entry point of python -m nqueen.
+    author: Jawad Chowdhury.
+"""
+from nqueen.cli import main
+
+main()
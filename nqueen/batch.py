@@ -0,0 +1,262 @@
+"""
+    Batched engine running many independent boards of the same n in lockstep as NumPy tensors.
+    author: Jawad Chowdhury.
+"""
+import time
+from nqueen.board import sample_cells, np
+from nqueen.rng import spawn_seed, get_master_seed, make_rng
+from nqueen.variants import get_variant
+
+BATCH_VARIANTS = ('basic', 'sideway', 'random_restart_basic', 'random_restart_sideway')
+CLIMB, PLATEAU = 0, 1
+
+class BatchNQueen:
+    """
+    This class runs no_runs boards, batch_size at a time, as a (batch_size x n) tensor of queen cells with the
+    row/column/diagonal/anti-diagonal counts as (batch_size x lines) tensors. Every step finds the best move of
+    all the boards in one vectorised pass and applies them together. A board that is solved or stuck is retired
+    and its slot is reloaded with the next run (or, for the random restart variants, restarted on a new random
+    board) without stopping the batch.
+    Run i draws its boards and its random ties from its own stream seeded with spawn_seed(seed, i), and every slot
+    steps through the same climbing/plateau states as the serial variant, so a run follows the same trajectory
+    (and gives the same counters) as in NQueen(seed=seed).run() with the free board model. Sideways moves are
+    allowed up to limit_sideway in a row on a plateau.
+    """
+    def __init__(self, no_runs, n, variant='basic', batch_size=1024, seed=None, limit_sideway=100, block_size=1 << 22):
+        if np == None:
+            raise ImportError('BatchNQueen needs numpy')
+        if variant not in BATCH_VARIANTS:
+            raise ValueError('variant %r has no batched version, expected one of: %s' % (variant, ', '.join(BATCH_VARIANTS)))
+        if not isinstance(limit_sideway, int):
+            raise ValueError('BatchNQueen takes an int limit_sideway, not %r' % (limit_sideway,))
+        self.no_runs = no_runs
+        self.n = n
+        self.variant = variant
+        self.batch_size = batch_size
+        self.limit_sideway = limit_sideway
+        self.block_size = block_size
+        self.restarts = get_variant(variant).restarts
+        self.sideway = get_variant(variant).limit_option != None
+        self.seed = seed
+        self.no_success = 0
+        self.no_total_steps = 0
+        self.no_success_steps = 0
+        self.no_random_restart = 0
+        self.no_neighbors = 0
+        self.no_sideway_moves = 0
+        self.no_plateaus = 0
+        self.run_records = []
+    def get_counters(self):
+        """
+        This method gives the counters collected over the runs done so far.
+        :return:
+        """
+        return {'no_success': self.no_success, 'no_total_steps': self.no_total_steps,
+                'no_success_steps': self.no_success_steps, 'no_random_restart': self.no_random_restart,
+                'no_neighbors': self.no_neighbors, 'no_sideway_moves': self.no_sideway_moves,
+                'no_plateaus': self.no_plateaus, 'run_records': self.run_records}
+    def random_position(self, rng):
+        """
+        This method gives a random board drawn from rng as the sorted cell indices (r*n + c) of its queens, drawn
+        the way NQueen.new_board draws it.
+        :param rng:
+        :return:
+        """
+        return sorted(sample_cells(self.n, rng))
+    def get_counts(self, pos):
+        """
+        This method gives the row, column, diagonal (r-c) and anti-diagonal (r+c) queen counts of every board.
+        :param pos:
+        :return:
+        """
+        n, k = self.n, len(pos)
+        r, c = np.divmod(pos, n)
+        offset = np.arange(k)[:, None]
+        row = np.bincount((offset*n + r).ravel(), minlength=k*n).reshape(k, n)
+        col = np.bincount((offset*n + c).ravel(), minlength=k*n).reshape(k, n)
+        diag = np.bincount((offset*(2*n-1) + r-c+n-1).ravel(), minlength=k*(2*n-1)).reshape(k, 2*n-1)
+        anti = np.bincount((offset*(2*n-1) + r+c).ravel(), minlength=k*(2*n-1)).reshape(k, 2*n-1)
+        return row, col, diag, anti
+    def get_hcost(self, pos):
+        """
+        This method gives the hcost of every board, the number of attacking pairs summed over all the lines.
+        :param pos:
+        :return:
+        """
+        return sum((count*(count-1)//2).sum(axis=1) for count in self.get_counts(pos))
+    def get_best_moves(self, pos, random_tie, rngs):
+        """
+        This method gives, per board, the smallest delta of the (queen x cell) delta-cost matrix with its queen index
+        and target cell, as Board.get_best_move does: the first minimum in row-major queen order, or where
+        random_tie is set, the k-th tied minimum with k drawn from the rng of the board. Boards without any move get
+        a delta of 8n or more.
+        The matrix is not built: two lines through a queen only meet on its own cell, so a move of the queen costs
+        added[cell] - removed[queen], less one on the 4n cells of its lines. The best delta of a queen and its
+        number of ties thus come from its line cells and a histogram of added over the board, O(n^2) per board
+        instead of O(n^3), and only the row of the queen holding the picked tie is built.
+        :param pos:
+        :param random_tie: one flag per board.
+        :param rngs: one random stream per board.
+        :return:
+        """
+        n, nn, k = self.n, self.n*self.n, len(pos)
+        row, col, diag, anti = self.get_counts(pos)
+        cr, cc = np.divmod(np.arange(nn), n)
+        qr, qc = np.divmod(pos, n)
+        b = np.arange(k)[:, None]
+        added = row[:, cr] + col[:, cc] + diag[:, cr-cc+n-1] + anti[:, cr+cc]
+        added[b, pos] = 16*n
+        removed = row[b, qr] + col[b, qc] + diag[b, qr-qc+n-1] + anti[b, qr+qc] - 4
+        histogram = np.bincount((b*(16*n+2) + added).ravel(), minlength=k*(16*n+2)).reshape(k, 16*n+2)
+        lowest = added.min(axis=1)
+        queen_best = np.empty((k, n), dtype=np.int64)
+        queen_ties = np.empty((k, n), dtype=np.int64)
+        i = np.arange(n)
+        step = max(1, self.block_size // (4*nn))
+        for start in range(0, k, step):
+            s = slice(start, start+step)
+            br, bc = qr[s, :, None], qc[s, :, None]
+            # the cells of the row, column, diagonal and anti-diagonal of every queen, 16n off the board
+            shape = br.shape[:2] + (n,)
+            at_row, at_col = np.broadcast_to(br, shape), np.broadcast_to(i, shape)
+            line_rows = np.concatenate((at_row, at_col, at_col, at_col), axis=2)
+            line_cols = np.concatenate((at_col, np.broadcast_to(bc, shape), i - br + bc, br + bc - i), axis=2)
+            inside = (line_cols >= 0) & (line_cols < n)
+            on_line = np.where(inside, added[np.arange(start, start+len(br))[:, None, None],
+                                             np.where(inside, line_rows*n + line_cols, 0)], 16*n)
+            target = np.minimum(lowest[s, None], on_line.min(axis=2) - 1)
+            queen_best[s] = target - removed[s]
+            # ties: the cells off the lines with added == target, and the ones on the lines with added == target+1
+            counted = histogram[np.arange(start, start+len(br))[:, None], np.clip(target, 0, None)] * (target >= 0)
+            queen_ties[s] = counted - (on_line == target[..., None]).sum(axis=2) \
+                            + (on_line == target[..., None] + 1).sum(axis=2)
+        best_delta = queen_best.min(axis=1)
+        ties = np.where(queen_best == best_delta[:, None], queen_ties, 0)
+        tie = np.zeros(k, dtype=np.int64)
+        for j in np.flatnonzero(random_tie & (best_delta < 8*n)):
+            tie[j] = rngs[j].randrange(int(ties[j].sum()))
+        last = ties.cumsum(axis=1)
+        queen = np.minimum((last <= tie[:, None]).sum(axis=1), n-1)
+        rank = tie - (last[b[:, 0], queen] - ties[b[:, 0], queen])
+        br, bc = qr[b[:, 0], queen][:, None], qc[b[:, 0], queen][:, None]
+        delta = added - removed[b[:, 0], queen][:, None] \
+                - (cr == br) - (cc == bc) - ((cr-cc) == (br-bc)) - ((cr+cc) == (br+bc))
+        cell = ((delta == best_delta[:, None]).cumsum(axis=1) > rank[:, None]).argmax(axis=1)
+        return best_delta, queen, cell
+    def run(self):
+        """
+        This method runs all the boards in lockstep until every run is done. A slot is in the CLIMB state while
+        it takes strictly improving moves and in the PLATEAU state while it takes sideways moves, the two loops
+        of the serial sideways variants.
+        :return:
+        """
+        n = self.n
+        base = get_master_seed(self.seed)
+        slots = min(self.batch_size, self.no_runs)
+        rngs = [make_rng(spawn_seed(base, i)) for i in range(slots)]
+        pos = np.array([self.random_position(rng) for rng in rngs], dtype=np.int64).reshape(slots, n)
+        hcost = self.get_hcost(pos)
+        run_id = np.arange(slots)
+        steps = np.zeros(slots, dtype=np.int64)
+        restarts = np.zeros(slots, dtype=np.int64)
+        sideways = np.zeros(slots, dtype=np.int64)
+        state = np.full(slots, CLIMB)
+        counter_sideway = np.zeros(slots, dtype=np.int64)
+        started = np.full(slots, time.perf_counter())
+        active = np.ones(slots, dtype=bool)
+        batch = {'base': base, 'rngs': rngs, 'pos': pos, 'hcost': hcost, 'run_id': run_id, 'steps': steps,
+                 'restarts': restarts, 'sideways': sideways, 'state': state, 'started': started, 'active': active}
+        next_run = slots
+        while active.any():
+            if self.sideway:
+                # the sideways variants stop before scanning a solved board
+                solved = np.flatnonzero(active & (state == CLIMB) & (hcost == 0))
+                if len(solved):
+                    for slot in solved:
+                        next_run = self.finish(batch, slot, True, next_run)
+                    continue
+            idx = np.flatnonzero(active)
+            plateau = state[idx] == PLATEAU
+            delta, queen, cell = self.get_best_moves(pos[idx], plateau, [rngs[slot] for slot in idx])
+            self.no_neighbors += len(idx) * n*(n*n-n)
+            valid = delta < 8*n
+            if self.sideway:
+                # CLIMB, improving: take it. CLIMB, not improving: enter the plateau, which counts as a sideways step.
+                # PLATEAU, sideways: take it while the limit allows. PLATEAU, improving: take it, back to CLIMB,
+                # unless the limit is already passed. PLATEAU, nothing <= 0: give up.
+                climb = ~plateau & valid & (delta < 0)
+                enter = ~plateau & ~climb
+                cs = counter_sideway[idx]
+                within = cs <= self.limit_sideway
+                side = plateau & valid & (delta == 0) & within
+                leave = plateau & valid & (delta < 0) & within
+                ends = plateau & ~side & ~leave
+                if self.limit_sideway < 0:
+                    ends = ends | enter
+                    enter = np.zeros_like(enter)
+                apply = climb | side | leave
+                entering = idx[enter]
+                steps[entering] += 1
+                sideways[entering] += 1
+                counter_sideway[entering] = 1
+                state[entering] = PLATEAU
+                steps[idx[climb | side]] += 1
+                sideways[idx[side]] += 1
+                counter_sideway[idx[side]] += 1
+                state[idx[leave]] = CLIMB
+                self.no_plateaus += int((leave | ends).sum())
+                done = ends
+            else:
+                apply = valid & (delta < 0)
+                steps[idx[apply]] += 1
+                done = ~apply
+            moved = idx[apply]
+            pos[moved, queen[apply]] = cell[apply]
+            pos[moved] = np.sort(pos[moved], axis=1)
+            hcost[moved] += delta[apply]
+            for slot in idx[done]:
+                next_run = self.finish(batch, slot, hcost[slot] == 0, next_run)
+    def finish(self, batch, slot, success, next_run):
+        """
+        This method ends the climb of a slot: a random restart variant that failed draws a new board from the
+        stream of the run, otherwise the run is retired and the slot gets the next run, if any.
+        :param batch: the per-slot arrays of run.
+        :param slot:
+        :param success:
+        :param next_run:
+        :return: the index of the next run.
+        """
+        base, rngs, pos, hcost, run_id = batch['base'], batch['rngs'], batch['pos'], batch['hcost'], batch['run_id']
+        steps, restarts, sideways = batch['steps'], batch['restarts'], batch['sideways']
+        if not success and self.restarts:
+            restarts[slot] += 1
+        else:
+            self.retire(run_id[slot], spawn_seed(base, int(run_id[slot])), success, int(steps[slot]),
+                        int(restarts[slot]), int(sideways[slot]), int(hcost[slot]),
+                        time.perf_counter() - batch['started'][slot])
+            if next_run >= self.no_runs:
+                batch['active'][slot] = False
+                return next_run
+            run_id[slot] = next_run
+            rngs[slot] = make_rng(spawn_seed(base, next_run))
+            steps[slot] = restarts[slot] = sideways[slot] = 0
+            batch['started'][slot] = time.perf_counter()
+            next_run += 1
+        pos[slot] = self.random_position(rngs[slot])
+        hcost[slot] = self.get_hcost(pos[slot:slot+1])[0]
+        batch['state'][slot] = CLIMB
+        return next_run
+    def retire(self, run, seed, success, steps, restarts, sideways, hcost, elapsed):
+        """
+        This method adds a finished run to the counters and the run records.
+        :return:
+        """
+        self.no_total_steps += steps
+        self.no_random_restart += restarts
+        self.no_sideway_moves += sideways
+        if success:
+            self.no_success += 1
+            self.no_success_steps += steps
+        self.run_records.append({'run': int(run), 'seed': seed, 'n': self.n, 'variant': self.variant,
+                                 'success': bool(success), 'steps': steps, 'restarts': restarts, 'hcost': hcost,
+                                 'elapsed': elapsed})
@@ -0,0 +1,143 @@
+"""
+    Benchmark suite sweeping n, variant and sideways limit, written to CSV or JSON.
+    usage: python -m nqueen.benchmark --n 8 16 32 --variant basic sideway --limit 10 100 --output bench.csv
+    author: Jawad Chowdhury.
+"""
+import argparse, csv, json, time, tracemalloc
+from nqueen.board import BOARD_MODELS
+from nqueen.budget import parse_limit
+from nqueen.search import NQueen
+from nqueen.variants import VARIANTS, get_variant
+
+# (n values, variants) swept when no --n is given: the full neighborhood scan is O(n^3) per step,
+# so those variants stop at n=32 while min_conflicts goes up to a few thousand queens. The sampling
+# variants are compared with random_restart_sideway on the larger boards it can still solve.
+DEFAULT_SUITE = [
+    ((8, 16, 32), ('basic', 'sideway', 'random_restart_basic', 'random_restart_sideway', 'local_beam')),
+    ((64, 128), ('random_restart_sideway',)),
+    ((8, 64, 512, 2048), ('min_conflicts',)),
+    ((8, 16, 32, 64, 128, 256), ('first_choice', 'stochastic', 'simulated_annealing')),
+]
+DEFAULT_LIMITS = (10, 100, 'adaptive')
+FIELDS = ['n', 'variant', 'model', 'limit', 'runs', 'seed', 'wall_time', 'steps', 'steps_per_sec', 'neighbors',
+          'neighbors_per_sec', 'peak_memory_kb', 'success_rate', 'time_per_success', 'restarts', 'avg_restarts']
+
+def get_cells(ns=None, variants=None, limits=None):
+    """
+    This function gives the (n, variant, limit) cells of the sweep. Variants without a sideways limit get
+    a single cell with limit None, and the limit 'adaptive' is only swept for the variants taking it.
+    :param ns:
+    :param variants:
+    :param limits:
+    :return:
+    """
+    suite = DEFAULT_SUITE if ns == None else [(ns, variants if variants else tuple(VARIANTS))]
+    cells = []
+    for suite_ns, suite_variants in suite:
+        for variant in suite_variants:
+            if variants and variant not in variants:
+                continue
+            variant_limits = (None,)
+            if get_variant(variant).limit_option:
+                variant_limits = [limit for limit in (limits if limits else DEFAULT_LIMITS)
+                                  if limit != 'adaptive' or get_variant(variant).adaptive]
+            for n in suite_ns:
+                for limit in variant_limits:
+                    cells.append((n, variant, limit))
+    return cells
+
+def run_cell(n, variant, limit, runs, seed=0, memory=True, model='free'):
+    """
+    This function runs one cell of the sweep and gives its record. The timing is taken without tracemalloc,
+    the peak memory is taken from one extra traced run.
+    :return:
+    """
+    options = {}
+    if limit != None:
+        options[get_variant(variant).limit_option] = limit
+    nq = NQueen(no_runs=runs, n=n, variant=variant, seed=seed, model=model)
+    start = time.perf_counter()
+    nq.run(**options)
+    wall_time = time.perf_counter() - start
+    peak_memory_kb = None
+    if memory:
+        tracemalloc.start()
+        NQueen(no_runs=1, n=n, variant=variant, seed=seed, model=model).run(**options)
+        peak_memory_kb = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    return {
+        'n': n, 'variant': variant, 'model': model, 'limit': limit, 'runs': runs, 'seed': seed,
+        'wall_time': wall_time,
+        'steps': nq.no_total_steps,
+        'steps_per_sec': nq.no_total_steps / wall_time if wall_time > 0 else 0,
+        'neighbors': nq.no_neighbors,
+        'neighbors_per_sec': nq.no_neighbors / wall_time if wall_time > 0 else 0,
+        'peak_memory_kb': peak_memory_kb,
+        'success_rate': nq.no_success / runs if runs else 0,
+        'time_per_success': wall_time / nq.no_success if nq.no_success else None,
+        'restarts': nq.no_random_restart,
+        'avg_restarts': nq.no_random_restart / runs if runs else 0,
+    }
+
+def run_benchmark(cells, runs, seed=0, memory=True, progress=None, model='free'):
+    """
+    This function runs all the cells and gives their records.
+    :param cells:
+    :param runs:
+    :param seed:
+    :param memory:
+    :param progress: called with every record once it is done.
+    :param model: board model, 'free' or 'permutation'.
+    :return:
+    """
+    records = []
+    for n, variant, limit in cells:
+        record = run_cell(n, variant, limit, runs, seed=seed, memory=memory, model=model)
+        records.append(record)
+        if progress:
+            progress(record)
+    return records
+
+def write_records(records, path):
+    """
+    This function writes the records as JSON if path ends with .json, as CSV otherwise.
+    :param records:
+    :param path:
+    :return:
+    """
+    with open(path, 'w', newline='') as f:
+        if path.endswith('.json'):
+            json.dump(records, f, indent=2)
+        else:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the hill climbing variants.')
+    parser.add_argument('--n', type=int, nargs='+', help='board sizes (default: built-in suite)')
+    parser.add_argument('--variant', nargs='+', choices=sorted(VARIANTS), help='variants (default: all)')
+    parser.add_argument('--limit', type=parse_limit, nargs='+',
+                        help="sideways limits, ints or 'adaptive' (default: %s)" % (DEFAULT_LIMITS,))
+    parser.add_argument('--model', default='free', choices=sorted(BOARD_MODELS), help='board model')
+    parser.add_argument('--runs', type=int, default=10, help='runs per cell')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc peak memory run')
+    parser.add_argument('--output', default='benchmark.csv', help='.csv or .json file')
+    args = parser.parse_args(argv)
+    cells = get_cells(args.n, args.variant, args.limit)
+    def progress(record):
+        print('n={n:<6} {variant:<24} limit={limit!s:<8} {wall_time:8.3f}s {steps_per_sec:10.1f} steps/s '
+              '{neighbors_per_sec:12.1f} neighbors/s success={success_rate:.2f}'.format(**record), flush=True)
+    records = []
+    def add_record(record):
+        records.append(record)
+        progress(record)
+    try:
+        run_benchmark(cells, args.runs, seed=args.seed, memory=not args.no_memory, progress=add_record,
+                      model=args.model)
+    finally:
+        write_records(records, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,954 @@
+"""
+    Board representation of the N-Queen problem shared by all the hill climbing variants.
+    author: Jawad Chowdhury.
+"""
+import random, copy
+from array import array
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from nqueen import kernel
+from nqueen.kernel import get_swap_line_delta
+
+MASK64 = (1 << 64) - 1
+
+def get_cell_key(i):
+    """
+    This function gives the 64-bit Zobrist key of the cell with index i (r*n + c). The keys are not drawn from a
+    table of n*n random numbers but mixed from the index with splitmix64, so that they need no memory for large n,
+    do not touch the random module and are the same in every process.
+    :param i:
+    :return:
+    """
+    z = (i + 0x9E3779B97F4A7C15) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+def get_cell_keys(cells):
+    """
+    This function is the NumPy version of get_cell_key for an array of cell indices, uint64 arithmetic wraps
+    modulo 2^64 as the masks do.
+    :param cells:
+    :return:
+    """
+    z = cells.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+def sample_cells(n, rng=random):
+    """
+    This function gives the cell indices (r*n + c) of n queens on n distinct random cells, sampled at once
+    without retrying on occupied cells.
+    :param n:
+    :param rng:
+    :return:
+    """
+    return rng.sample(range(n*n), n)
+
+def set_conflict(conflicted, position, q, is_conflicted):
+    """
+    This function adds the queen q to, or removes it from, the set of conflicted queens held as an array of queen
+    ids (conflicted) and the position of every queen in it (-1 when absent), in constant time.
+    :param conflicted:
+    :param position:
+    :param q:
+    :param is_conflicted:
+    :return:
+    """
+    k = position[q]
+    if is_conflicted and k < 0:
+        position[q] = len(conflicted)
+        conflicted.append(q)
+    elif not is_conflicted and k >= 0:
+        last = conflicted.pop()
+        if last != q:
+            conflicted[k] = last
+            position[last] = k
+        position[q] = -1
+
+class Board:
+    """
+    This class maintains properties related to the different state of the N-Queen Problem.
+    The queens are kept as two coordinate arrays plus a bitset of occupied cells, the n x n grid
+    of '_'/'Q' is only built in __str__ and get_state. zobrist is the XOR of the keys of the occupied cells,
+    kept up to date by move_queen. The random draws (placement, random ties) come from the rng given to
+    the methods, a random.Random or by default the random module itself.
+    For large n a move is O(1): queen_index maps a cell (r*n + c) to its queen id (its index in rows/cols), every
+    line keeps the XOR of the ids of its queens next to its count, which names the queen left alone on a line, and
+    the conflicted queens are kept as a set (conflicted, conflict_pos) updated from the lines a move changes.
+    """
+    __slots__ = ('n', 'rows', 'cols', 'occupied', 'row_count', 'col_count', 'diag_count', 'anti_count', 'hcost',
+                 'zobrist', 'queen_index', 'row_xor', 'col_xor', 'diag_xor', 'anti_xor', 'conflicted', 'conflict_pos')
+    def __init__(self, n, state=None, hcost=None, rng=random):
+        self.n = n
+        typecode = 'H' if n <= 0xFFFF else 'L'
+        self.rows = array(typecode)
+        self.cols = array(typecode)
+        self.occupied = bytearray((n*n+7)//8)
+        self.queen_index = {}
+        if state==None:
+            self.place_random_queens(rng)
+        else:
+            for r in range(n):
+                for c in range(n):
+                    if state[r][c] == 'Q':
+                        self.add_queen(r, c)
+            self.set_counters()
+        if hcost==None:
+            self.hcost = self.get_hcost()
+        else:
+            self.hcost = hcost
+    def place_random_queens(self, rng=random):
+        """
+        This method places the n queens on the cells given by sample_cells and builds the bitset, the counters and
+        the Zobrist hash in that same pass, with NumPy from n = 64 on.
+        :param rng:
+        :return:
+        """
+        n = self.n
+        cells = sample_cells(n, rng)
+        if np != None and n >= 64:
+            self.place_queens_numpy(np.array(cells, dtype=np.int64))
+            return
+        self.clear_counters()
+        occupied, rows, cols, queen_index = self.occupied, self.rows, self.cols, self.queen_index
+        row_count, col_count, diag_count, anti_count = self.row_count, self.col_count, self.diag_count, self.anti_count
+        row_xor, col_xor, diag_xor, anti_xor = self.row_xor, self.col_xor, self.diag_xor, self.anti_xor
+        zobrist = 0
+        for q, i in enumerate(cells):
+            r, c = divmod(i, n)
+            occupied[i >> 3] |= 1 << (i & 7)
+            queen_index[i] = q
+            rows.append(r)
+            cols.append(c)
+            row_count[r] += 1
+            col_count[c] += 1
+            diag_count[r-c+n-1] += 1
+            anti_count[r+c] += 1
+            row_xor[r] ^= q
+            col_xor[c] ^= q
+            diag_xor[r-c+n-1] ^= q
+            anti_xor[r+c] ^= q
+            zobrist ^= get_cell_key(i)
+        self.zobrist = zobrist
+        self.set_conflicted_queens()
+    def place_queens_numpy(self, cells):
+        """
+        This method is the NumPy version of the pass of place_random_queens over an array of distinct cell indices,
+        which also builds the line XORs, queen_index and the conflicted queens.
+        :param cells:
+        :return:
+        """
+        n, typecode = self.n, self.rows.typecode
+        r, c = np.divmod(cells, n)
+        self.rows = array(typecode, r.astype(typecode).tobytes())
+        self.cols = array(typecode, c.astype(typecode).tobytes())
+        occupied = np.zeros(len(self.occupied), dtype=np.uint8)
+        np.bitwise_or.at(occupied, cells >> 3, (1 << (cells & 7)).astype(np.uint8))
+        self.occupied = bytearray(occupied.tobytes())
+        row, col = np.bincount(r, minlength=n), np.bincount(c, minlength=n)
+        diag, anti = np.bincount(r-c+n-1, minlength=2*n-1), np.bincount(r+c, minlength=2*n-1)
+        self.row_count = array(typecode, row.astype(typecode).tobytes())
+        self.col_count = array(typecode, col.astype(typecode).tobytes())
+        self.diag_count = array(typecode, diag.astype(typecode).tobytes())
+        self.anti_count = array(typecode, anti.astype(typecode).tobytes())
+        self.zobrist = int(np.bitwise_xor.reduce(get_cell_keys(cells)))
+        q = np.arange(n, dtype=np.int64)
+        self.queen_index = dict(zip(cells.tolist(), range(n)))
+        for name, lines, size in (('row_xor', r, n), ('col_xor', c, n), ('diag_xor', r-c+n-1, 2*n-1),
+                                  ('anti_xor', r+c, 2*n-1)):
+            xor = np.zeros(size, dtype=np.int64)
+            np.bitwise_xor.at(xor, lines, q)
+            setattr(self, name, array(typecode, xor.astype(typecode).tobytes()))
+        conflicted = np.flatnonzero(row[r] + col[c] + diag[r-c+n-1] + anti[r+c] > 4)
+        position = np.full(n, -1, dtype=np.int64)
+        position[conflicted] = np.arange(len(conflicted))
+        self.conflicted = array(typecode, conflicted.astype(typecode).tobytes())
+        self.conflict_pos = array('q', position.tobytes())
+    def add_queen(self, r, c):
+        """
+        This method places a queen on the empty cell (r, c).
+        :param r:
+        :param c:
+        :return:
+        """
+        i = r*self.n + c
+        self.occupied[i >> 3] |= 1 << (i & 7)
+        self.queen_index[i] = len(self.rows)
+        self.rows.append(r)
+        self.cols.append(c)
+    def is_occupied(self, r, c):
+        """
+        This method checks the bitset for a queen on the cell (r, c).
+        :param r:
+        :param c:
+        :return:
+        """
+        i = r*self.n + c
+        return (self.occupied[i >> 3] >> (i & 7)) & 1 == 1
+    def get_queens(self):
+        """
+        This method gives the queen coordinates in row-major order.
+        :return:
+        """
+        return sorted(zip(self.rows, self.cols))
+    def get_state(self):
+        """
+        This method gives the n x n grid of '_'/'Q' for the current board.
+        :return:
+        """
+        state = [['_' for c in range(self.n)] for r in range(self.n)]
+        for r, c in zip(self.rows, self.cols):
+            state[r][c] = 'Q'
+        return state
+    def clear_counters(self):
+        """
+        This method sets all the line counters and XORs and the Zobrist hash to zero.
+        :return:
+        """
+        typecode, itemsize = self.rows.typecode, self.rows.itemsize
+        self.zobrist = 0
+        self.row_count = array(typecode, bytes(itemsize*self.n))
+        self.col_count = array(typecode, bytes(itemsize*self.n))
+        self.diag_count = array(typecode, bytes(itemsize*(2*self.n-1)))
+        self.anti_count = array(typecode, bytes(itemsize*(2*self.n-1)))
+        self.row_xor = array(typecode, bytes(itemsize*self.n))
+        self.col_xor = array(typecode, bytes(itemsize*self.n))
+        self.diag_xor = array(typecode, bytes(itemsize*(2*self.n-1)))
+        self.anti_xor = array(typecode, bytes(itemsize*(2*self.n-1)))
+    def set_counters(self):
+        """
+        This method builds the number of queens and the XOR of their ids on every row, column, diagonal (r-c)
+        and anti-diagonal (r+c), the conflicted queens and the Zobrist hash of the board.
+        :return:
+        """
+        self.clear_counters()
+        for q, (r, c) in enumerate(zip(self.rows, self.cols)):
+            self.row_count[r] += 1
+            self.col_count[c] += 1
+            self.diag_count[r-c+self.n-1] += 1
+            self.anti_count[r+c] += 1
+            self.row_xor[r] ^= q
+            self.col_xor[c] ^= q
+            self.diag_xor[r-c+self.n-1] ^= q
+            self.anti_xor[r+c] ^= q
+            self.zobrist ^= get_cell_key(r*self.n + c)
+        self.set_conflicted_queens()
+    def set_conflicted_queens(self):
+        """
+        This method builds the set of conflicted queens from the counters, in queen id order.
+        :return:
+        """
+        self.conflicted = array(self.rows.typecode)
+        self.conflict_pos = array('q', [-1]) * len(self.rows)
+        for q in range(len(self.rows)):
+            self.update_conflict(q)
+    def update_conflict(self, q):
+        """
+        This method adds the queen of id q to the conflicted queens, or removes it, from its line counts.
+        :param q:
+        :return:
+        """
+        r, c, n = self.rows[q], self.cols[q], self.n
+        set_conflict(self.conflicted, self.conflict_pos, q,
+                     self.row_count[r] + self.col_count[c] + self.diag_count[r-c+n-1] + self.anti_count[r+c] > 4)
+    def move_delta(self, src, dst):
+        """
+        This method gives the change of hcost when the queen at src is moved to the empty cell dst, in constant time.
+        :param src:
+        :param dst:
+        :return:
+        """
+        r, c = src
+        nr, nc = dst
+        removed = (self.row_count[r] - 1) + (self.col_count[c] - 1) \
+                  + (self.diag_count[r-c+self.n-1] - 1) + (self.anti_count[r+c] - 1)
+        added = (self.row_count[nr] - (nr == r)) + (self.col_count[nc] - (nc == c)) \
+                + (self.diag_count[nr-nc+self.n-1] - (nr-nc == r-c)) + (self.anti_count[nr+nc] - (nr+nc == r+c))
+        return added - removed
+    def move_queen(self, src, dst):
+        """
+        This method moves the queen at src to the empty cell dst in place, updating the bitset, the counters and
+        the Zobrist hash. Only a queen left alone on a line the queen leaves, or joined on a line it enters, can
+        change its conflicted state, and the line XOR names it, so the move is O(1).
+        :param src:
+        :param dst:
+        :return:
+        """
+        n = self.n
+        r, c = src
+        nr, nc = dst
+        i, j = r*n + c, nr*n + nc
+        q = self.queen_index.pop(i)
+        self.queen_index[j] = q
+        self.rows[q] = nr
+        self.cols[q] = nc
+        self.occupied[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+        self.occupied[j >> 3] |= 1 << (j & 7)
+        self.zobrist ^= get_cell_key(i) ^ get_cell_key(j)
+        changed = [q]
+        for count, xor, line, new_line in ((self.row_count, self.row_xor, r, nr), (self.col_count, self.col_xor, c, nc),
+                                           (self.diag_count, self.diag_xor, r-c+n-1, nr-nc+n-1),
+                                           (self.anti_count, self.anti_xor, r+c, nr+nc)):
+            count[line] -= 1
+            xor[line] ^= q
+            if count[line] == 1:
+                changed.append(xor[line])
+            count[new_line] += 1
+            xor[new_line] ^= q
+            if count[new_line] == 2:
+                changed.append(xor[new_line] ^ q)
+        for p in changed:
+            self.update_conflict(p)
+    def copy(self):
+        """
+        This method gives an independent copy of the board without recomputing anything.
+        :return:
+        """
+        board = Board.__new__(Board)
+        for attr in Board.__slots__:
+            value = getattr(self, attr)
+            setattr(board, attr, copy.copy(value))
+        return board
+    def get_neighbor(self, src, dst, delta=None):
+        """
+        This method gives a new board with the queen at src moved to dst, reusing the known cost delta.
+        :param src:
+        :param dst:
+        :param delta:
+        :return:
+        """
+        neighbor = self.copy()
+        neighbor.apply_move(src, dst, delta)
+        return neighbor
+    def apply_move(self, src, dst, delta=None):
+        """
+        This method makes the move in place, with its cost delta, and gives the delta.
+        :param src:
+        :param dst:
+        :param delta:
+        :return:
+        """
+        if delta==None:
+            delta = self.move_delta(src, dst)
+        self.move_queen(src, dst)
+        self.hcost += delta
+        return delta
+    def get_neighborhood_size(self):
+        """
+        This method gives the number of neighbors, every queen moved to every empty cell.
+        :return:
+        """
+        return self.n*(self.n*self.n - self.n)
+    def get_random_queen(self, rng=random, conflicted=False):
+        """
+        This method gives the cell of a random queen, drawn among the conflicted ones with conflicted, in O(1).
+        :param rng:
+        :param conflicted:
+        :return: the cell, or None if there is no such queen.
+        """
+        queens = self.conflicted if conflicted else self.rows
+        if len(queens) == 0:
+            return None
+        q = queens[rng.randrange(len(queens))] if conflicted else rng.randrange(len(queens))
+        return self.rows[q], self.cols[q]
+    def get_random_move(self, rng=random, conflicted=False):
+        """
+        This method gives a random move: a random queen, drawn among the conflicted ones with conflicted, to a
+        random empty cell of its row or column, the moves get_min_conflicts_move weighs. Other cells are left out
+        as a move off the queen's lines almost never helps once the board is nearly solved.
+        :param rng:
+        :param conflicted:
+        :return: the move, or None if there is none.
+        """
+        n = self.n
+        src = self.get_random_queen(rng, conflicted) if n >= 2 else None
+        if src == None:
+            return None
+        while True:
+            t = rng.randrange(2*n)
+            r, c = (src[0], t) if t < n else (t-n, src[1])
+            if not self.is_occupied(r, c):
+                return src, (r, c)
+    def get_queen_move_deltas(self, src):
+        """
+        This method gives the delta of moving the queen at src to every cell of its row then of its column, the
+        move of index t being get_queen_move(src, t), 16n for the occupied cells. It is one NumPy pass over the
+        lines of the queen, or a list of move_delta values without NumPy.
+        :param src:
+        :return:
+        """
+        n = self.n
+        r, c = src
+        if np == None:
+            return [16*n if self.is_occupied(*dst) else self.move_delta(src, dst)
+                    for src, dst in (self.get_queen_move(src, t) for t in range(2*n))]
+        typecode = self.rows.typecode
+        row = np.frombuffer(self.row_count, dtype=typecode).astype(np.int64)
+        col = np.frombuffer(self.col_count, dtype=typecode).astype(np.int64)
+        diag = np.frombuffer(self.diag_count, dtype=typecode).astype(np.int64)
+        anti = np.frombuffer(self.anti_count, dtype=typecode).astype(np.int64)
+        removed = int(row[r] + col[c] + diag[r-c+n-1] + anti[r+c]) - 4
+        along_row = (int(row[r]) - 1 - removed) + col + diag[r:r+n][::-1] + anti[r:r+n]
+        along_col = (int(col[c]) - 1 - removed) + row + diag[n-1-c:2*n-1-c] + anti[c:c+n]
+        deltas = np.concatenate((along_row, along_col))
+        t = np.arange(n, dtype=np.int64)
+        cells = np.concatenate((r*n + t, t*n + c))
+        occupied = np.frombuffer(self.occupied, dtype=np.uint8)
+        deltas[(occupied[cells >> 3] >> (cells & 7)) & 1 == 1] = 16*n
+        return deltas
+    def get_queen_move(self, src, index):
+        """
+        This method gives the move of the given index in get_queen_move_deltas(src).
+        :param src:
+        :param index:
+        :return:
+        """
+        n = self.n
+        return src, ((src[0], index) if index < n else (index-n, src[1]))
+    def get_vacated_cells(self, move):
+        """
+        This method gives the cells the move leaves empty, the ones a tabu list remembers.
+        :param move:
+        :return:
+        """
+        return [move[0]]
+    def is_tabu(self, move, tabu):
+        """
+        This method checks whether the move puts a queen back on a cell of the tabu list.
+        :param move:
+        :param tabu:
+        :return:
+        """
+        return move[1] in tabu
+    def scan_best_move(self, random_tie=False, tabu=None, rng=random):
+        """
+        This method is the loop version of get_best_move, run by kernel.scan_free_moves: compiled with Numba when
+        it is installed, plain Python otherwise. A first scan gives the smallest delta and its number of ties,
+        a second one finds the tie drawn with random_tie, so it picks the same move as the NumPy version.
+        :param random_tie:
+        :param tabu:
+        :param rng:
+        :return:
+        """
+        n = self.n
+        queens = self.get_queens()
+        blocked = bytearray(n*n)
+        for r, c in list(queens) + list(tabu or ()):
+            blocked[r*n+c] = 1
+        args = kernel.get_kernel_arrays([q[0] for q in queens], [q[1] for q in queens], blocked, self.row_count,
+                                        self.col_count, self.diag_count, self.anti_count)
+        best_delta, ties, index = kernel.scan_free_moves(n, *args, 0, -1)
+        if ties == 0:
+            return None, None
+        if random_tie:
+            k = rng.randrange(ties)
+            if k > 0:
+                index = kernel.scan_free_moves(n, *args, best_delta, k)[2]
+        q, cell = divmod(int(index), n*n)
+        return int(best_delta), (queens[q], divmod(cell, n))
+    def move_zobrist(self, src, dst):
+        """
+        This method gives the Zobrist hash the board would have after moving the queen at src to dst.
+        :param src:
+        :param dst:
+        :return:
+        """
+        return self.zobrist ^ get_cell_key(src[0]*self.n + src[1]) ^ get_cell_key(dst[0]*self.n + dst[1])
+    def get_delta_terms(self, tabu=None):
+        """
+        This method gives the NumPy terms of the (queen x cell) delta-cost matrix: the queens in row-major order
+        with their coordinates, the cell coordinates, the queens a queen arriving on each cell would attack (16n on
+        occupied or tabu cells, so that moves there get a delta of 8n or more) and the ones each queen leaving
+        stops attacking.
+        :param tabu:
+        :return:
+        """
+        n = self.n
+        queens = self.get_queens()
+        qr = np.array([q[0] for q in queens], dtype=np.int64)
+        qc = np.array([q[1] for q in queens], dtype=np.int64)
+        row_count = np.frombuffer(self.row_count, dtype=self.row_count.typecode).astype(np.int64)
+        col_count = np.frombuffer(self.col_count, dtype=self.col_count.typecode).astype(np.int64)
+        diag_count = np.frombuffer(self.diag_count, dtype=self.diag_count.typecode).astype(np.int64)
+        anti_count = np.frombuffer(self.anti_count, dtype=self.anti_count.typecode).astype(np.int64)
+        cr, cc = np.divmod(np.arange(n*n, dtype=np.int64), n)
+        added = row_count[cr] + col_count[cc] + diag_count[cr-cc+n-1] + anti_count[cr+cc]
+        added[qr*n+qc] = 16*n
+        if tabu:
+            added[[r*n+c for r, c in tabu]] = 16*n
+        removed = row_count[qr] + col_count[qc] + diag_count[qr-qc+n-1] + anti_count[qr+qc] - 4
+        return queens, qr, qc, cr, cc, added, removed
+    def get_delta_block(self, terms, start, stop):
+        """
+        This method gives the rows start to stop of the delta-cost matrix built from get_delta_terms, flattened.
+        :param terms:
+        :param start:
+        :param stop:
+        :return:
+        """
+        queens, qr, qc, cr, cc, added, removed = terms
+        br, bc = qr[start:stop, None], qc[start:stop, None]
+        delta = added[None, :] - removed[start:stop, None] \
+                - (cr == br) - (cc == bc) - ((cr-cc) == (br-bc)) - ((cr+cc) == (br+bc))
+        return delta.ravel()
+    def get_move_deltas(self):
+        """
+        This method gives the delta of every move as one flat sequence, the move of index i being get_move(i):
+        queens in row-major order, then target cells in row-major order, 8n or more for the occupied cells.
+        It is a NumPy array, or a list of move_delta values without NumPy.
+        :return:
+        """
+        n = self.n
+        if np == None:
+            return [16*n if self.is_occupied(nr, nc) else self.move_delta(src, (nr, nc))
+                    for src in self.get_queens() for nr in range(n) for nc in range(n)]
+        return self.get_delta_block(self.get_delta_terms(), 0, n)
+    def get_move(self, index):
+        """
+        This method gives the move of the given index in get_move_deltas.
+        :param index:
+        :return:
+        """
+        q, cell = divmod(index, self.n*self.n)
+        return self.get_queens()[q], divmod(cell, self.n)
+    def get_best_move(self, random_tie=False, tabu=None, block_size=1 << 22, rng=random):
+        """
+        This method builds the (queen x cell) delta-cost matrix with NumPy and gives the smallest delta with its move.
+        Queens are taken in row-major order, so the first minimum is the move the nested loop scan would pick;
+        with random_tie one of the tied minima is picked at random instead. Cells in tabu are left out as
+        destinations. The matrix is built in blocks of queens so that it never holds more than block_size entries.
+        Without NumPy, or with the compiled kernel, it falls back to scan_best_move.
+        :param random_tie:
+        :param tabu:
+        :param block_size:
+        :param rng:
+        :return:
+        """
+        if np == None or kernel.COMPILED:
+            return self.scan_best_move(random_tie, tabu, rng)
+        n = self.n
+        terms = self.get_delta_terms(tabu)
+        queens = terms[0]
+        step = max(1, block_size // (n*n))
+        best_delta, best_index, tied = None, None, []
+        for start in range(0, len(queens), step):
+            delta = self.get_delta_block(terms, start, start+step)
+            block_best = int(delta.min())
+            if best_delta == None or block_best < best_delta:
+                best_delta = block_best
+                best_index = start*n*n + int(delta.argmin())
+                tied = []
+            if random_tie and block_best == best_delta:
+                tied.append((start, np.flatnonzero(delta == block_best)))
+        if best_delta == None or best_delta >= 8*n:
+            return None, None
+        if random_tie:
+            k = rng.randrange(sum(len(t) for _, t in tied))
+            for start, t in tied:
+                if k < len(t):
+                    best_index = start*n*n + int(t[k])
+                    break
+                k -= len(t)
+        q, cell = divmod(best_index, n*n)
+        return best_delta, (queens[q], divmod(cell, n))
+    def get_hvcost(self):
+        """
+        This method gives the number of attacking pairs on rows and columns, summing C(k,2) over the row and
+        column histograms.
+        :return:
+        """
+        hvcost = sum(k*(k-1) for k in self.row_count) + sum(k*(k-1) for k in self.col_count)
+        hvcost = hvcost/2
+        return hvcost
+    def get_dcost(self):
+        """
+        This method gives the number of attacking pairs on diagonals and anti-diagonals, summing C(k,2) over the
+        diagonal histograms.
+        :return:
+        """
+        dcost = sum(k*(k-1) for k in self.diag_count) + sum(k*(k-1) for k in self.anti_count)
+        dcost = dcost/2
+        return dcost
+    def get_hcost(self):
+        """
+        This method is being used to calculate the heuristic cost of the current board, in one pass over the
+        line histograms built by set_counters.
+        :return:
+        """
+        hvcost = self.get_hvcost()
+        dcost = self.get_dcost()
+        hcost = hvcost + dcost
+        return hcost
+    def __str__(self):
+        """
+        String representation of the state.
+        :return:
+        """
+        lines = [''.join([cell + ' ' for cell in row]) for row in self.get_state()]
+        lines.append('hcost : ' + str(self.hcost))
+        return '\n'.join(lines) + '\n'
+
+class PermutationBoard:
+    """
+    This class is the permutation model of the N-Queen Problem: row r holds exactly one queen, in column cols[r],
+    so there can be no row or column conflict and only the diagonals are counted. A move swaps the columns of
+    two rows, which gives n(n-1)/2 neighbors instead of n(n^2-n). It has the same interface as Board, with rows
+    in place of cells as move endpoints. The queen id is its row, the diagonals keep the XOR of the rows of their
+    queens and the conflicted queens are kept as a set, as in Board.
+    """
+    __slots__ = ('n', 'cols', 'diag_count', 'anti_count', 'hcost', 'zobrist', 'diag_xor', 'anti_xor', 'conflicted',
+                 'conflict_pos')
+    def __init__(self, n, state=None, hcost=None, rng=random):
+        self.n = n
+        typecode = 'H' if n <= 0xFFFF else 'L'
+        if state==None:
+            cols = list(range(n))
+            rng.shuffle(cols)
+        else:
+            cols = [row.index('Q') for row in state]
+            if sorted(cols) != list(range(n)) or any(row.count('Q') != 1 for row in state):
+                raise ValueError('a permutation board needs exactly one queen per row and per column')
+        self.cols = array(typecode, cols)
+        self.set_counters()
+        if hcost==None:
+            self.hcost = self.get_hcost()
+        else:
+            self.hcost = hcost
+    @property
+    def rows(self):
+        return range(self.n)
+    def is_occupied(self, r, c):
+        """
+        This method checks for a queen on the cell (r, c).
+        :param r:
+        :param c:
+        :return:
+        """
+        return self.cols[r] == c
+    def get_queens(self):
+        """
+        This method gives the queen coordinates in row-major order.
+        :return:
+        """
+        return list(enumerate(self.cols))
+    def get_state(self):
+        """
+        This method gives the n x n grid of '_'/'Q' for the current board.
+        :return:
+        """
+        state = [['_' for c in range(self.n)] for r in range(self.n)]
+        for r, c in enumerate(self.cols):
+            state[r][c] = 'Q'
+        return state
+    def set_counters(self):
+        """
+        This method builds the number of queens and the XOR of their rows on every diagonal (r-c) and
+        anti-diagonal (r+c), the conflicted queens and the Zobrist hash of the board, with NumPy from n = 64 on.
+        :return:
+        """
+        n, typecode = self.n, self.cols.typecode
+        if np != None and n >= 64:
+            r = np.arange(n, dtype=np.int64)
+            c = np.frombuffer(self.cols, dtype=typecode).astype(np.int64)
+            diag, anti = np.bincount(r-c+n-1, minlength=2*n-1), np.bincount(r+c, minlength=2*n-1)
+            self.diag_count = array(typecode, diag.astype(typecode).tobytes())
+            self.anti_count = array(typecode, anti.astype(typecode).tobytes())
+            for name, lines in (('diag_xor', r-c+n-1), ('anti_xor', r+c)):
+                xor = np.zeros(2*n-1, dtype=np.int64)
+                np.bitwise_xor.at(xor, lines, r)
+                setattr(self, name, array(typecode, xor.astype(typecode).tobytes()))
+            self.zobrist = int(np.bitwise_xor.reduce(get_cell_keys(r*n + c)))
+            conflicted = np.flatnonzero(diag[r-c+n-1] + anti[r+c] > 2)
+            position = np.full(n, -1, dtype=np.int64)
+            position[conflicted] = np.arange(len(conflicted))
+            self.conflicted = array(typecode, conflicted.astype(typecode).tobytes())
+            self.conflict_pos = array('q', position.tobytes())
+            return
+        self.zobrist = 0
+        self.diag_count = array(self.cols.typecode, bytes(self.cols.itemsize*(2*self.n-1)))
+        self.anti_count = array(self.cols.typecode, bytes(self.cols.itemsize*(2*self.n-1)))
+        self.diag_xor = array(self.cols.typecode, bytes(self.cols.itemsize*(2*self.n-1)))
+        self.anti_xor = array(self.cols.typecode, bytes(self.cols.itemsize*(2*self.n-1)))
+        for r, c in enumerate(self.cols):
+            self.diag_count[r-c+self.n-1] += 1
+            self.anti_count[r+c] += 1
+            self.diag_xor[r-c+self.n-1] ^= r
+            self.anti_xor[r+c] ^= r
+            self.zobrist ^= get_cell_key(r*self.n + c)
+        self.conflicted = array(self.cols.typecode)
+        self.conflict_pos = array('q', [-1]) * n
+        for r in range(n):
+            self.update_conflict(r)
+    def update_conflict(self, q):
+        """
+        This method adds the queen of row q to the conflicted queens, or removes it, from its diagonal counts.
+        :param q:
+        :return:
+        """
+        c, n = self.cols[q], self.n
+        set_conflict(self.conflicted, self.conflict_pos, q, self.diag_count[q-c+n-1] + self.anti_count[q+c] > 2)
+    def move_delta(self, src, dst):
+        """
+        This method gives the change of hcost when the columns of rows src and dst are swapped, in constant time.
+        It sums get_swap_line_delta over the diagonals and the anti-diagonals.
+        :param src:
+        :param dst:
+        :return:
+        """
+        n, i, j = self.n, src, dst
+        a, b = self.cols[i], self.cols[j]
+        return get_swap_line_delta(self.diag_count, i-a+n-1, j-b+n-1, i-b+n-1, j-a+n-1) \
+               + get_swap_line_delta(self.anti_count, i+a, j+b, i+b, j+a)
+    def move_queen(self, src, dst):
+        """
+        This method swaps the columns of rows src and dst in place, updating the counters, the conflicted queens
+        (as Board.move_queen does) and the Zobrist hash.
+        :param src:
+        :param dst:
+        :return:
+        """
+        n, i, j = self.n, src, dst
+        a, b = self.cols[i], self.cols[j]
+        changed = [i, j]
+        for count, xor, lines, new_lines in ((self.diag_count, self.diag_xor, (i-a+n-1, j-b+n-1), (i-b+n-1, j-a+n-1)),
+                                             (self.anti_count, self.anti_xor, (i+a, j+b), (i+b, j+a))):
+            for row, line in zip((i, j), lines):
+                count[line] -= 1
+                xor[line] ^= row
+                if count[line] == 1:
+                    changed.append(xor[line])
+            for row, line in zip((i, j), new_lines):
+                count[line] += 1
+                xor[line] ^= row
+                if count[line] == 2:
+                    changed.append(xor[line] ^ row)
+        self.cols[i], self.cols[j] = b, a
+        self.zobrist ^= get_cell_key(i*n+a) ^ get_cell_key(j*n+b) ^ get_cell_key(i*n+b) ^ get_cell_key(j*n+a)
+        for p in changed:
+            self.update_conflict(p)
+    def copy(self):
+        """
+        This method gives an independent copy of the board without recomputing anything.
+        :return:
+        """
+        board = PermutationBoard.__new__(PermutationBoard)
+        for attr in PermutationBoard.__slots__:
+            setattr(board, attr, copy.copy(getattr(self, attr)))
+        return board
+    def get_neighbor(self, src, dst, delta=None):
+        """
+        This method gives a new board with the columns of rows src and dst swapped, reusing the known cost delta.
+        :param src:
+        :param dst:
+        :param delta:
+        :return:
+        """
+        neighbor = self.copy()
+        neighbor.apply_move(src, dst, delta)
+        return neighbor
+    def apply_move(self, src, dst, delta=None):
+        """
+        This method makes the swap in place, with its cost delta, and gives the delta.
+        :param src:
+        :param dst:
+        :param delta:
+        :return:
+        """
+        if delta==None:
+            delta = self.move_delta(src, dst)
+        self.move_queen(src, dst)
+        self.hcost += delta
+        return delta
+    def get_neighborhood_size(self):
+        """
+        This method gives the number of neighbors, every pair of rows swapped.
+        :return:
+        """
+        return self.n*(self.n-1)//2
+    def get_random_queen(self, rng=random, conflicted=False):
+        """
+        This method gives the row of a random queen, drawn among the conflicted ones with conflicted, in O(1).
+        :param rng:
+        :param conflicted:
+        :return: the row, or None if there is no such queen.
+        """
+        if not conflicted:
+            return rng.randrange(self.n) if self.n else None
+        if len(self.conflicted) == 0:
+            return None
+        return self.conflicted[rng.randrange(len(self.conflicted))]
+    def get_random_move(self, rng=random, conflicted=False):
+        """
+        This method gives a random move: the swap of a random row, drawn among the conflicted queens with
+        conflicted, with another one.
+        :param rng:
+        :param conflicted:
+        :return: the move, or None if there is none.
+        """
+        n = self.n
+        i = self.get_random_queen(rng, conflicted) if n >= 2 else None
+        if i == None:
+            return None
+        j = rng.randrange(n-1)
+        return (i, j) if j < i else (i, j+1)
+    def get_queen_move_deltas(self, src):
+        """
+        This method gives the delta of swapping row src with every row, the swap of index t being
+        get_queen_move(src, t), 8n for src itself. It is one NumPy pass, or a list of move_delta values without
+        NumPy.
+        :param src:
+        :return:
+        """
+        n = self.n
+        if np == None:
+            return [8*n if t == src else self.move_delta(src, t) for t in range(n)]
+        deltas = self.get_swap_deltas(src, np.arange(n, dtype=np.int64))
+        deltas[src] = 8*n
+        return deltas
+    def get_queen_move(self, src, index):
+        """
+        This method gives the swap of the given index in get_queen_move_deltas(src).
+        :param src:
+        :param index:
+        :return:
+        """
+        return src, index
+    def get_vacated_cells(self, move):
+        """
+        This method gives the cells the swap leaves empty, the ones a tabu list remembers.
+        :param move:
+        :return:
+        """
+        i, j = move
+        return [(i, self.cols[i]), (j, self.cols[j])]
+    def is_tabu(self, move, tabu):
+        """
+        This method checks whether the swap puts a queen back on a cell of the tabu list.
+        :param move:
+        :param tabu:
+        :return:
+        """
+        i, j = move
+        return (i, self.cols[j]) in tabu or (j, self.cols[i]) in tabu
+    def scan_best_move(self, random_tie=False, tabu=None, rng=random):
+        """
+        This method is the loop version of get_best_move, run by kernel.scan_swap_moves as in Board.scan_best_move.
+        :param random_tie:
+        :param tabu:
+        :param rng:
+        :return:
+        """
+        n = self.n
+        blocked = bytearray(n*n)
+        for r, c in tabu or ():
+            blocked[r*n+c] = 1
+        args = kernel.get_kernel_arrays(self.cols, blocked, self.diag_count, self.anti_count)
+        best_delta, ties, index = kernel.scan_swap_moves(n, *args, 0, -1)
+        if ties == 0:
+            return None, None
+        if random_tie:
+            k = rng.randrange(ties)
+            if k > 0:
+                index = kernel.scan_swap_moves(n, *args, best_delta, k)[2]
+        return int(best_delta), divmod(int(index), n)
+    def move_zobrist(self, src, dst):
+        """
+        This method gives the Zobrist hash the board would have after swapping the columns of rows src and dst.
+        :param src:
+        :param dst:
+        :return:
+        """
+        n, i, j = self.n, src, dst
+        a, b = self.cols[i], self.cols[j]
+        return self.zobrist ^ get_cell_key(i*n+a) ^ get_cell_key(j*n+b) ^ get_cell_key(i*n+b) ^ get_cell_key(j*n+a)
+    def get_move_deltas(self, tabu=None):
+        """
+        This method gives the delta of every swap as one flat sequence, the swap of index i being get_move(i):
+        the (row x row) delta matrix in row-major order, 8n on and below the diagonal and for the swaps putting a
+        queen on a cell in tabu. It is a NumPy array, or a list of move_delta values without NumPy.
+        :param tabu:
+        :return:
+        """
+        n = self.n
+        if np == None:
+            return [self.move_delta(i, j) if i < j and not (tabu and self.is_tabu((i, j), tabu)) else 8*n
+                    for i in range(n) for j in range(n)]
+        r = np.arange(n, dtype=np.int64)
+        c = np.frombuffer(self.cols, dtype=self.cols.typecode).astype(np.int64)
+        delta = self.get_swap_deltas(r[:, None], r[None, :])
+        delta[np.tril_indices(n)] = 8*n
+        if tabu:
+            cells = np.zeros((n, n), dtype=bool)
+            cells[tuple(zip(*tabu))] = True
+            returns = cells[:, c]
+            delta[returns | returns.T] = 8*n
+        return delta.ravel()
+    def get_swap_deltas(self, i, j):
+        """
+        This method is the NumPy version of move_delta for (broadcast) arrays of rows i and j.
+        :param i:
+        :param j:
+        :return:
+        """
+        n = self.n
+        c = np.frombuffer(self.cols, dtype=self.cols.typecode).astype(np.int64)
+        a, b = c[i], c[j]
+        delta = 0
+        for count, p, q, s, t in ((self.diag_count, i-a+n-1, j-b+n-1, i-b+n-1, j-a+n-1),
+                                  (self.anti_count, i+a, j+b, i+b, j+a)):
+            count = np.frombuffer(count, dtype=count.typecode).astype(np.int64)
+            delta = delta - (count[p] - 1) - (count[q] - 1 - (q == p)) \
+                    + (count[s] - (s == p) - (s == q)) + (count[t] - (t == p) - (t == q) + (t == s))
+        return delta
+    def get_move(self, index):
+        """
+        This method gives the swap of the given index in get_move_deltas.
+        :param index:
+        :return:
+        """
+        return divmod(index, self.n)
+    def get_best_move(self, random_tie=False, tabu=None, rng=random):
+        """
+        This method builds the (row x row) swap delta matrix with NumPy and gives the smallest delta with its swap,
+        the first one in row-major order or, with random_tie, one of the tied minima at random. Swaps putting a
+        queen on a cell in tabu are left out. Without NumPy, or with the compiled kernel, it falls back to
+        scan_best_move.
+        :param random_tie:
+        :param tabu:
+        :param rng:
+        :return:
+        """
+        if np == None or kernel.COMPILED or self.n < 2:
+            return self.scan_best_move(random_tie, tabu, rng)
+        n = self.n
+        delta = self.get_move_deltas(tabu)
+        best_delta = int(delta.min())
+        if best_delta >= 8*n:
+            return None, None
+        if random_tie:
+            tied = np.flatnonzero(delta == best_delta)
+            index = int(tied[rng.randrange(len(tied))])
+        else:
+            index = int(delta.argmin())
+        return best_delta, divmod(index, n)
+    def get_hcost(self):
+        """
+        This method is being used to calculate the heuristic cost of the current board, the attacking pairs on
+        the diagonals and anti-diagonals.
+        :return:
+        """
+        return sum(k*(k-1)//2 for k in self.diag_count) + sum(k*(k-1)//2 for k in self.anti_count)
+    def __str__(self):
+        """
+        String representation of the state.
+        :return:
+        """
+        lines = [''.join([cell + ' ' for cell in row]) for row in self.get_state()]
+        lines.append('hcost : ' + str(self.hcost))
+        return '\n'.join(lines) + '\n'
+
+BOARD_MODELS = {'free': Board, 'permutation': PermutationBoard}
@@ -0,0 +1,97 @@
+"""
+    Adaptive sideways-move budget of the sideways variants, learned from the plateaus of the batch.
+    author: Jawad Chowdhury.
+"""
+import math
+
+class SidewayBudget:
+    """
+    This class is a sideways limit that adapts to the plateaus seen so far, given in place of the integer limit of
+    a sideways variant (or as limit 'adaptive', see get_limit_option). Every plateau is recorded with the number of
+    sideways moves it took before an improving move, or with the limit it was given up at, which gives the
+    (Kaplan-Meier) chance of leaving a plateau within B sideways moves. Giving up costs a restart, about the steps
+    it took to climb to the plateau, so the limit of a plateau is slack times the B minimizing the expected steps
+    to leave it: (sideways moves within B + restart cost if not left) / chance of leaving within B. The limit is
+    thus short when long plateaus are dead ends and long when they are left in the end, and the slack keeps
+    trying longer ones. Until min_samples plateaus are seen it is prior_per_n * n. Only the last max_samples
+    plateaus are kept. It learns from the runs in order, so NQueen.iter_runs only takes it for serial runs and saves
+    it in its checkpoints; in a portfolio every chain learns from its own plateaus.
+    With the sideway variant a given up plateau ends the run, so the budget trades success rate for steps, as
+    the steps per solution count the failed runs.
+    """
+    def __init__(self, slack=1.5, prior_per_n=2, min_limit=4, max_limit=10000, min_samples=16, max_samples=512):
+        self.slack = slack
+        self.prior_per_n = prior_per_n
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.plateaus = []
+    def get_limit(self, n, climbed=0):
+        """
+        This method gives the number of sideways moves the next plateau of an n-queen board may take.
+        :param n:
+        :param climbed: the steps taken since the last (re)start, the cost of getting back to such a plateau.
+        :return:
+        """
+        if len(self.plateaus) < self.min_samples:
+            return max(self.min_limit, min(self.max_limit, self.prior_per_n * n))
+        at_risk, survival, expected, previous = len(self.plateaus), 1.0, 0.0, 0
+        best_limit, best_cost = None, None
+        plateaus = sorted(self.plateaus)
+        i = 0
+        while i < len(plateaus):
+            length = plateaus[i][0]
+            escaped = given_up = 0
+            while i < len(plateaus) and plateaus[i][0] == length:
+                escaped += plateaus[i][1]
+                given_up += not plateaus[i][1]
+                i += 1
+            expected += survival * (length - previous)
+            previous = length
+            if escaped:
+                survival *= 1 - escaped / at_risk
+                cost = (expected + survival * climbed) / (1 - survival)
+                if best_cost == None or cost < best_cost:
+                    best_limit, best_cost = length, cost
+            at_risk -= escaped + given_up
+        if best_limit == None:
+            return self.min_limit
+        return max(self.min_limit, min(self.max_limit, math.ceil(self.slack * best_limit)))
+    def add_plateau(self, length, escaped):
+        """
+        This method records a plateau that was left after length sideways moves, or given up at length.
+        :param length:
+        :param escaped: the plateau was left by an improving move.
+        :return:
+        """
+        self.plateaus.append((length, bool(escaped)))
+        if len(self.plateaus) > self.max_samples:
+            del self.plateaus[0]
+
+def parse_limit(value):
+    """
+    This function parses a sideways limit given on the command line, an int or 'adaptive'.
+    :param value:
+    :return:
+    """
+    return value if value == 'adaptive' else int(value)
+
+def get_limit_option(limit):
+    """
+    This function gives the value of a sideways limit option: a new SidewayBudget for 'adaptive', the limit itself
+    otherwise.
+    :param limit:
+    :return:
+    """
+    return SidewayBudget() if limit == 'adaptive' else limit
+
+def get_sideway_limit(limit, n, climbed=0):
+    """
+    This function gives the sideways limit of the next plateau from a limit option, an int or a SidewayBudget.
+    :param limit:
+    :param n:
+    :param climbed:
+    :return:
+    """
+    return limit.get_limit(n, climbed) if isinstance(limit, SidewayBudget) else limit
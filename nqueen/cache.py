@@ -0,0 +1,65 @@
+"""
+    Size-bounded transposition cache of board costs, keyed by the Zobrist hash of the boards.
+    author: Jawad Chowdhury.
+"""
+from collections import OrderedDict
+
+EVICTION_POLICIES = ('lru', 'fifo')
+
+class CostCache:
+    """
+    This class maps the Zobrist hash of a board to its hcost and holds at most max_size entries.
+    When it is full, 'lru' evicts the least recently used entry and 'fifo' the oldest inserted one.
+    """
+    def __init__(self, max_size=1 << 16, eviction='lru'):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError('unknown eviction policy %r, expected one of: %s' % (eviction, ', '.join(EVICTION_POLICIES)))
+        if max_size < 1:
+            raise ValueError('a cost cache needs max_size >= 1, got %r' % (max_size,))
+        self.max_size = max_size
+        self.eviction = eviction
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    def __len__(self):
+        return len(self.entries)
+    def get(self, key):
+        """
+        This method gives the cached hcost of the board with the given hash, or None, counting the hit or miss.
+        :param key:
+        :return:
+        """
+        value = self.entries.get(key)
+        if value == None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.eviction == 'lru':
+            self.entries.move_to_end(key)
+        return value
+    def put(self, key, value):
+        """
+        This method stores the hcost of the board with the given hash, evicting an entry if the cache is full.
+        :param key:
+        :param value:
+        :return:
+        """
+        if key in self.entries:
+            self.entries[key] = value
+            if self.eviction == 'lru':
+                self.entries.move_to_end(key)
+            return
+        if len(self.entries) >= self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        self.entries[key] = value
+    def get_stats(self):
+        """
+        This method gives the hit/miss statistics of the cache.
+        :return:
+        """
+        lookups = self.hits + self.misses
+        return {'size': len(self.entries), 'max_size': self.max_size, 'eviction': self.eviction, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0}
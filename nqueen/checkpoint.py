@@ -0,0 +1,56 @@
+"""
+    Checkpoint file of a long batch of runs, written atomically so that a crash never leaves a partial one.
+    author: Jawad Chowdhury.
+"""
+import os, pickle, time
+
+class Checkpoint:
+    """
+    This class saves and loads the progress of NQueen.iter_runs to a local file. A save writes a temporary
+    file next to it, syncs it and renames it over the old one, so the file always holds a complete checkpoint.
+    Saves asked with save_if_due are only done every `every` seconds.
+    """
+    def __init__(self, path, every=60.0):
+        self.path = path
+        self.every = every
+        self.last_save = time.monotonic()
+        self.no_saves = 0
+    def exists(self):
+        return os.path.exists(self.path)
+    def load(self):
+        """
+        This method gives the state of the last checkpoint, or None if there is none.
+        :return:
+        """
+        if not self.exists():
+            return None
+        with open(self.path, 'rb') as f:
+            return pickle.load(f)
+    def save(self, state):
+        """
+        This method writes the state to the checkpoint file atomically.
+        :param state:
+        :return:
+        """
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.last_save = time.monotonic()
+        self.no_saves += 1
+    def is_due(self):
+        """
+        This method checks whether `every` seconds went by since the last save.
+        :return:
+        """
+        return time.monotonic() - self.last_save >= self.every
+    def save_if_due(self, get_state):
+        """
+        This method saves the state given by get_state() if a save is due, so the state is only built when needed.
+        :param get_state:
+        :return:
+        """
+        if self.is_due():
+            self.save(get_state())
@@ -0,0 +1,170 @@
+"""
+    Command line interface running one configuration, or every job of a job-spec file, in a single process.
+    usage: python -m nqueen --n 8 --runs 100 --variant random_restart_sideway --limit 100 --seed 0 --workers 4
+           python -m nqueen --jobs jobs.json --format csv --output results.csv
+    A job-spec file is a JSON list (or a .jsonl file) of jobs such as
+    {"n": 16, "variant": "sideway", "runs": 500, "limit": 50, "model": "permutation", "options": {"tabu_size": 8}},
+    missing keys are taken from the command line.
+    author: Jawad Chowdhury.
+"""
+import argparse, csv, inspect, json, sys, textwrap, time
+from nqueen.board import BOARD_MODELS
+from nqueen.budget import parse_limit
+from nqueen.checkpoint import Checkpoint
+from nqueen.results import JsonlSink, read_jsonl
+from nqueen.search import NQueen
+from nqueen.variants import VARIANTS, get_variant
+
+FORMATS = ('text', 'json', 'csv', 'jsonl')
+JOB_KEYS = ('n', 'variant', 'runs', 'limit', 'seed', 'model', 'workers', 'options')
+RESUME_OPTIONS = ('steps_done', 'restarts_done')
+RESULT_FIELDS = ['n', 'variant', 'model', 'limit', 'runs', 'seed', 'workers', 'wall_time', 'success_rate',
+                 'avg_steps', 'avg_restarts', 'avg_hcost', 'avg_elapsed']
+
+def read_jobs(path):
+    """
+    This function gives the jobs of a job-spec file, a JSON list of objects or a JSONL file of them.
+    :param path:
+    :return:
+    """
+    if path.endswith('.jsonl'):
+        jobs = list(read_jsonl(path))
+    else:
+        with open(path) as f:
+            jobs = json.load(f)
+    for job in jobs:
+        unknown = set(job) - set(JOB_KEYS)
+        if unknown:
+            raise ValueError('unknown job keys %s in %s, expected some of: %s' % (sorted(unknown), path, ', '.join(JOB_KEYS)))
+    return jobs
+
+def get_job(spec, defaults):
+    """
+    This function completes a job spec with the defaults and checks it.
+    :param spec:
+    :param defaults:
+    :return:
+    """
+    job = dict(defaults, **spec)
+    if job['n'] == None:
+        raise ValueError('job %r has no n' % (spec,))
+    if not isinstance(job['n'], int) or job['n'] < 1:
+        raise ValueError('n must be an integer of at least 1, not %r' % (job['n'],))
+    if not isinstance(job['runs'], int) or job['runs'] < 0:
+        raise ValueError('runs must be a non-negative integer, not %r' % (job['runs'],))
+    if job['workers'] != None and (not isinstance(job['workers'], int) or job['workers'] < 1):
+        raise ValueError('workers must be a positive integer, not %r' % (job['workers'],))
+    variant = get_variant(job['variant'])
+    if job['limit'] != None:
+        if not variant.limit_option:
+            raise ValueError('variant %r takes no sideways limit, not %r' % (job['variant'], job['limit']))
+        if job['limit'] != 'adaptive' and (not isinstance(job['limit'], int) or isinstance(job['limit'], bool)):
+            raise ValueError("limit must be an integer or 'adaptive', not %r" % (job['limit'],))
+    if job['limit'] == 'adaptive' and not variant.adaptive:
+        raise ValueError("variant %r takes no 'adaptive' limit" % (job['variant'],))
+    if job['limit'] == 'adaptive' and variant.adaptive and job['workers'] != None and job['workers'] > 1:
+        raise ValueError("an 'adaptive' limit needs serial runs, not workers=%d" % job['workers'])
+    if job['model'] not in BOARD_MODELS:
+        raise ValueError('unknown board model %r, expected one of: %s' % (job['model'], ', '.join(BOARD_MODELS)))
+    if not isinstance(job['options'] or {}, dict):
+        raise ValueError('options must be an object, not %r' % (job['options'],))
+    names = [name for name in list(inspect.signature(variant).parameters)[2:] if name not in RESUME_OPTIONS]
+    unknown = set(job['options'] or {}) - set(names)
+    if unknown:
+        raise ValueError('variant %r takes no option %s, expected some of: %s'
+                         % (job['variant'], ', '.join(sorted(unknown)), ', '.join(names) or '(none)'))
+    return job
+
+def run_job(job, sink=None, checkpoint=None, resume=False):
+    """
+    This function runs one job and gives its result line.
+    :param job:
+    :param sink: gets the record of every run.
+    :param checkpoint:
+    :param resume:
+    :return: the result and the NQueen that ran it.
+    """
+    options = dict(job['options'] or {})
+    limit_option = get_variant(job['variant']).limit_option
+    if job['limit'] != None and limit_option:
+        options[limit_option] = job['limit']
+    nq = NQueen(no_runs=job['runs'], n=job['n'], variant=job['variant'], seed=job['seed'], model=job['model'])
+    start = time.perf_counter()
+    nq.run(workers=job['workers'], sink=sink, keep_records=False, checkpoint=checkpoint, resume=resume, **options)
+    wall_time = time.perf_counter() - start
+    stats = nq.stats.get_stats()
+    result = {'n': job['n'], 'variant': job['variant'], 'model': job['model'],
+              'limit': job['limit'] if limit_option else None, 'runs': job['runs'], 'seed': job['seed'],
+              'workers': job['workers'], 'wall_time': wall_time, 'success_rate': stats['success_rate'],
+              'avg_steps': stats['steps']['mean'], 'avg_restarts': stats['restarts']['mean'],
+              'avg_hcost': stats['hcost']['mean'], 'avg_elapsed': stats['elapsed']['mean']}
+    return result, nq
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m nqueen', description='Run the N-Queen hill climbing variants.')
+    parser.add_argument('--n', type=int, help='board size')
+    parser.add_argument('--runs', type=int, default=100, help='number of runs (default: 100)')
+    parser.add_argument('--variant', default='basic', choices=sorted(VARIANTS))
+    parser.add_argument('--limit', type=parse_limit,
+                        help="sideways limit of the sideways variants, or 'adaptive' for a SidewayBudget")
+    parser.add_argument('--model', default='free', choices=sorted(BOARD_MODELS), help='board model')
+    parser.add_argument('--seed', type=int, help='master seed, every run draws from its own stream spawned from it')
+    parser.add_argument('--workers', type=int, help='worker processes')
+    parser.add_argument('--option', action='append', default=[], metavar='KEY=VALUE',
+                        help='extra variant option, VALUE parsed as JSON (e.g. tabu_size=8)')
+    parser.add_argument('--jobs', help='job-spec file (.json list or .jsonl) of configurations to run')
+    parser.add_argument('--format', default='text', choices=FORMATS,
+                        help='text summary, json/csv result per job, or jsonl record per run')
+    parser.add_argument('--output', default='-', help='output file (default: stdout)')
+    parser.add_argument('--checkpoint', help='checkpoint file of a single job')
+    parser.add_argument('--checkpoint-every', type=float, default=60.0, help='seconds between checkpoints')
+    parser.add_argument('--resume', action='store_true', help='continue the single job from its checkpoint')
+    args = parser.parse_args(argv)
+    if args.n == None and args.jobs == None:
+        parser.error('one of --n or --jobs is required')
+    options = {}
+    for option in args.option:
+        key, _, value = option.partition('=')
+        try:
+            options[key] = json.loads(value)
+        except ValueError:
+            options[key] = value
+    defaults = {'n': args.n, 'variant': args.variant, 'runs': args.runs, 'limit': args.limit, 'seed': args.seed,
+                'model': args.model, 'workers': args.workers, 'options': options}
+    try:
+        jobs = [get_job(spec, defaults) for spec in (read_jobs(args.jobs) if args.jobs else [{}])]
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if args.checkpoint and len(jobs) > 1:
+        parser.error('--checkpoint needs a single job')
+    checkpoint = Checkpoint(args.checkpoint, every=args.checkpoint_every) if args.checkpoint else None
+    sink = JsonlSink(args.output, append=args.resume) if args.format == 'jsonl' else None
+    out = sys.stdout if args.output == '-' or sink != None else open(args.output, 'w', newline='')
+    writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS) if args.format == 'csv' else None
+    if writer != None:
+        writer.writeheader()
+    elif args.format == 'json':
+        out.write('[')
+    try:
+        # every result is written as soon as its job is done, so a failing job keeps the ones before it
+        for i, job in enumerate(jobs):
+            result, nq = run_job(job, sink=sink, checkpoint=checkpoint, resume=args.resume)
+            if args.format == 'text':
+                out.write('n={n} variant={variant} model={model} limit={limit} runs={runs} seed={seed} '
+                          'wall_time={wall_time:.3f}s\n'.format(**result))
+                out.write('\n'.join(nq.get_summary()) + '\n\n')
+            elif args.format == 'json':
+                out.write((',\n' if i else '\n') + textwrap.indent(json.dumps(result, indent=2), '  '))
+            elif writer != None:
+                writer.writerow(result)
+            out.flush()
+    finally:
+        if args.format == 'json':
+            out.write('\n]\n' if jobs else ']\n')
+        if sink != None:
+            sink.close()
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+    Neighborhood scan kernels on int arrays, compiled with Numba when it is installed and run as plain Python
+    otherwise, from the same source.
+    author: Jawad Chowdhury.
+"""
+try:
+    import numba
+    import numpy as np
+except ImportError:
+    numba = None
+
+COMPILED = numba != None
+
+def get_kernel_arrays(*arrays):
+    """
+    This function gives the arrays (lists, arrays or bytearrays of ints) in the form the kernels take: int64 NumPy
+    arrays for the compiled kernels, as they are for the Python ones.
+    :param arrays:
+    :return:
+    """
+    if not COMPILED:
+        return arrays
+    return tuple(np.asarray(a, dtype=np.int64) for a in arrays)
+
+def get_swap_line_delta(count, p, q, s, t):
+    """
+    This function gives the change of the attacking pairs on one family of lines (diagonals or anti-diagonals)
+    when two queens leave their lines p and q and join s and t; each step counts against the lines already updated.
+    :return:
+    """
+    return - (count[p] - 1) - (count[q] - 1 - (q == p)) \
+           + (count[s] - (s == p) - (s == q)) + (count[t] - (t == p) - (t == q) + (t == s))
+
+def scan_free_moves(n, qr, qc, blocked, row_count, col_count, diag_count, anti_count, best, k):
+    """
+    This function scans the moves of a free board, queens (qr, qc) in row-major order then target cells in
+    row-major order, leaving out the cells set in blocked (the queens and the tabu cells). With k < 0 it gives
+    the smallest delta, the number of moves reaching it and the index (q*n*n + cell) of the first one; with k >= 0
+    it gives the index of the k-th move of delta best instead, the draw among the tied moves.
+    :return: best delta, number of tied moves (0 if there is no move) and move index.
+    """
+    found = 0
+    index = -1
+    for q in range(len(qr)):
+        r = qr[q]
+        c = qc[q]
+        removed = row_count[r] + col_count[c] + diag_count[r-c+n-1] + anti_count[r+c] - 4
+        for nr in range(n):
+            for nc in range(n):
+                i = nr*n + nc
+                if blocked[i]:
+                    continue
+                delta = row_count[nr] + col_count[nc] + diag_count[nr-nc+n-1] + anti_count[nr+nc] - removed
+                if nr == r:
+                    delta -= 1
+                if nc == c:
+                    delta -= 1
+                if nr-nc == r-c:
+                    delta -= 1
+                if nr+nc == r+c:
+                    delta -= 1
+                if k < 0:
+                    if found == 0 or delta < best:
+                        best = delta
+                        found = 1
+                        index = q*n*n + i
+                    elif delta == best:
+                        found += 1
+                elif delta == best:
+                    if found == k:
+                        return best, found, q*n*n + i
+                    found += 1
+    return best, found, index
+
+def scan_swap_moves(n, cols, blocked, diag_count, anti_count, best, k):
+    """
+    This function scans the swaps (i, j), i < j, of a permutation board in row-major order as scan_free_moves
+    scans the moves of a free board, leaving out the swaps putting a queen on a cell set in blocked (the tabu
+    cells). Move indices are i*n + j.
+    :return: best delta, number of tied swaps (0 if there is no swap) and swap index.
+    """
+    found = 0
+    index = -1
+    for i in range(n):
+        a = cols[i]
+        for j in range(i+1, n):
+            b = cols[j]
+            if blocked[i*n+b] or blocked[j*n+a]:
+                continue
+            delta = line_delta(diag_count, i-a+n-1, j-b+n-1, i-b+n-1, j-a+n-1) \
+                    + line_delta(anti_count, i+a, j+b, i+b, j+a)
+            if k < 0:
+                if found == 0 or delta < best:
+                    best = delta
+                    found = 1
+                    index = i*n + j
+                elif delta == best:
+                    found += 1
+            elif delta == best:
+                if found == k:
+                    return best, found, i*n + j
+                found += 1
+    return best, found, index
+
+line_delta = get_swap_line_delta
+if COMPILED:
+    line_delta = numba.njit(get_swap_line_delta)
+    scan_free_moves = numba.njit(scan_free_moves)
+    scan_swap_moves = numba.njit(scan_swap_moves)
@@ -0,0 +1,138 @@
+"""
+    Streaming of the per-run records: buffered JSONL sink and incremental statistics in constant memory.
+    author: Jawad Chowdhury.
+"""
+import json, math, os, sys
+
+class JsonlSink:
+    """
+    This class appends records to a JSONL file ('-' for stdout), one JSON object per line. Lines are buffered and
+    written once the buffer holds buffer_size characters, on flush or on close.
+    """
+    def __init__(self, path, buffer_size=1 << 16, append=True):
+        self.path = path
+        self.file = sys.stdout if path == '-' else open(path, 'a' if append else 'w')
+        self.buffer = []
+        self.buffered = 0
+        self.buffer_size = buffer_size
+    def write(self, record):
+        """
+        This method adds a record to the file.
+        :param record:
+        :return:
+        """
+        line = json.dumps(record)
+        self.buffer.append(line)
+        self.buffered += len(line) + 1
+        if self.buffered >= self.buffer_size:
+            self.flush()
+    def flush(self):
+        """
+        This method writes out the buffered lines.
+        :return:
+        """
+        if self.buffer:
+            self.file.write('\n'.join(self.buffer) + '\n')
+            self.file.flush()
+            self.buffer = []
+            self.buffered = 0
+    def truncate(self, next_run):
+        """
+        This method drops the records of the runs from next_run on (and a last line cut short), the ones written
+        after the checkpoint a batch resumes from, so the resumed runs do not write them twice.
+        :param next_run:
+        :return:
+        """
+        self.flush()
+        if self.file is sys.stdout:
+            return
+        self.file.close()
+        tmp_path = self.path + '.tmp'
+        with open(self.path) as f, open(tmp_path, 'w') as out:
+            for line in f:
+                if line.endswith('\n') and line.strip() and json.loads(line)['run'] < next_run:
+                    out.write(line)
+        os.replace(tmp_path, self.path)
+        self.file = open(self.path, 'a')
+    def close(self):
+        self.flush()
+        if self.file is not sys.stdout:
+            self.file.close()
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        self.close()
+
+def read_jsonl(path):
+    """
+    This function gives the records of a JSONL file one at a time.
+    :param path:
+    :return:
+    """
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+class RunningStats:
+    """
+    This class keeps the count, mean, variance (Welford's update), min and max of a stream of values.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+    def add(self, x):
+        """
+        This method adds a value to the statistics.
+        :param x:
+        :return:
+        """
+        self.count += 1
+        d = x - self.mean
+        self.mean += d / self.count
+        self.m2 += d * (x - self.mean)
+        self.min = x if self.min == None or x < self.min else self.min
+        self.max = x if self.max == None or x > self.max else self.max
+    def get_std(self):
+        """
+        This method gives the sample standard deviation.
+        :return:
+        """
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+    def get_stats(self):
+        return {'count': self.count, 'mean': self.mean, 'std': self.get_std(), 'min': self.min, 'max': self.max}
+
+class RunStats:
+    """
+    This class aggregates the run records as they stream in: number of runs and successes, plus the running
+    statistics of the steps, restarts, final hcost and elapsed time of a run.
+    """
+    FIELDS = ('steps', 'restarts', 'hcost', 'elapsed')
+    def __init__(self):
+        self.no_runs = 0
+        self.no_success = 0
+        self.fields = {field: RunningStats() for field in RunStats.FIELDS}
+    def add(self, record):
+        """
+        This method adds a run record to the statistics.
+        :param record:
+        :return:
+        """
+        self.no_runs += 1
+        if record['success']:
+            self.no_success += 1
+        for field, stats in self.fields.items():
+            stats.add(record[field])
+    def get_stats(self):
+        """
+        This method gives the aggregated statistics of the runs added so far.
+        :return:
+        """
+        stats = {'runs': self.no_runs, 'success': self.no_success,
+                 'success_rate': self.no_success / self.no_runs if self.no_runs else 0}
+        for field, field_stats in self.fields.items():
+            stats[field] = field_stats.get_stats()
+        return stats
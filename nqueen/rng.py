@@ -0,0 +1,33 @@
+"""
+    Seeding of the runs: every run gets its own random.Random, seeded from a child seed of the master seed.
+    author: Jawad Chowdhury.
+"""
+import hashlib, random
+
+def spawn_seed(base, i):
+    """
+    This function gives the seed of the i-th child stream of the master seed base. Like NumPy's
+    SeedSequence(base).spawn, the child seeds are hashed from (base, i), so nearby master seeds or run indices
+    give unrelated streams; unlike it, it does not need NumPy and any child can be had in O(1).
+    :param base:
+    :param i:
+    :return: a 64-bit seed.
+    """
+    digest = hashlib.sha256(('%d/%d' % (base, i)).encode()).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+def get_master_seed(seed=None):
+    """
+    This function gives the master seed, a fresh random one when seed is None.
+    :param seed:
+    :return:
+    """
+    return seed if seed != None else random.SystemRandom().randrange(2**64)
+
+def make_rng(seed):
+    """
+    This function gives the random stream of a run from its seed.
+    :param seed:
+    :return:
+    """
+    return random.Random(seed)
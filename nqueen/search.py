@@ -0,0 +1,639 @@
+"""
+    Implementation of hill climbing search and its variants.
+    author: Jawad Chowdhury.
+"""
+import time, io, heapq
+import cProfile, pstats, tracemalloc
+import multiprocessing, functools, queue
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from nqueen.board import BOARD_MODELS, np
+from nqueen.budget import SidewayBudget
+from nqueen.cache import CostCache
+from nqueen.results import RunStats
+from nqueen.rng import spawn_seed, get_master_seed, make_rng
+from nqueen.variants import get_variant, get_variant_options
+from nqueen.trace import Trace
+
+class NQueen:
+    """
+    This class is being used to maintain the overall flow of the N-Queen problem.
+    With cache_size, the from-scratch cost of the boards goes through a CostCache keyed by their Zobrist hash.
+    seed is the master seed of the runs, run i draws from its own stream seeded with spawn_seed(seed, i). rng is
+    the stream used by hill_climbing on boards given by the caller, seeded with seed by default.
+    """
+    def __init__(self, no_runs, n, variant='basic', seed=None, trace_level='none', trace_sink=None, model='free',
+                 cache_size=0, cache_eviction='lru', rng=None):
+        self.no_runs = no_runs
+        self.n = n
+        self.variant = variant
+        if model not in BOARD_MODELS:
+            raise ValueError('unknown board model %r, expected one of: %s' % (model, ', '.join(BOARD_MODELS)))
+        self.model = model
+        self.no_success = 0
+        self.no_total_steps = 0
+        self.no_success_steps = 0
+        self.no_random_restart = 0
+        self.no_neighbors = 0
+        self.no_cost_evaluations = 0
+        self.no_sideway_moves = 0
+        self.no_tabu_avoided = 0
+        self.no_tabu_saved = 0
+        self.no_tabu_rescans = 0
+        self.no_cache_hits = 0
+        self.no_cache_misses = 0
+        self.time_best_neighbor = 0.0
+        self.time_cost = 0.0
+        self.no_plateaus = 0
+        self.plateau_lengths = []
+        self.run_records = []
+        self.stats = RunStats()
+        self.seed = seed
+        self.rng = rng if rng != None else make_rng(seed)
+        self.stop_event = None
+        self.on_restart = None
+        self.trace = Trace(trace_level, sink=trace_sink)
+        self.cache = CostCache(cache_size, cache_eviction) if cache_size else None
+    def get_counters(self):
+        """
+        This method gives the counters collected over the runs done so far. Lists are merged by concatenation.
+        :return:
+        """
+        return {'no_success': self.no_success, 'no_total_steps': self.no_total_steps,
+                'no_success_steps': self.no_success_steps, 'no_random_restart': self.no_random_restart,
+                'no_neighbors': self.no_neighbors, 'no_cost_evaluations': self.no_cost_evaluations,
+                'no_sideway_moves': self.no_sideway_moves, 'no_tabu_avoided': self.no_tabu_avoided,
+                'no_tabu_saved': self.no_tabu_saved, 'no_tabu_rescans': self.no_tabu_rescans,
+                'no_cache_hits': self.no_cache_hits, 'no_cache_misses': self.no_cache_misses,
+                'time_best_neighbor': self.time_best_neighbor, 'time_cost': self.time_cost,
+                'no_plateaus': self.no_plateaus, 'plateau_lengths': self.plateau_lengths, 'run_records': self.run_records}
+    def merge_counters(self, counters):
+        """
+        This method adds the counters of other runs, e.g. the ones done by a worker process.
+        :param counters:
+        :return:
+        """
+        for key, value in counters.items():
+            setattr(self, key, getattr(self, key) + value)
+    def stopped(self):
+        """
+        This method checks whether another chain of the portfolio has already found the solution.
+        :return:
+        """
+        return self.stop_event != None and self.stop_event.is_set()
+    def restarted(self, board, steps, restarts):
+        """
+        This method is called by the restart variants each time they start over from a new board, the point at
+        which the run can be checkpointed.
+        :param board:
+        :param steps: steps of the run so far.
+        :param restarts: restarts of the run so far.
+        :return:
+        """
+        if self.on_restart != None:
+            self.on_restart(board, steps, restarts)
+    def new_board(self):
+        """
+        This method gives a new random board of the model with its cost.
+        :return:
+        """
+        board = BOARD_MODELS[self.model](n=self.n, hcost=0, rng=self.rng)
+        board.hcost = self.evaluate(board)
+        return board
+    def evaluate(self, board):
+        """
+        This method gives the from-scratch cost of the board, counting and timing it. With a cache, a board whose
+        Zobrist hash was already seen takes its cost from the cache instead.
+        :param board:
+        :return:
+        """
+        start = time.perf_counter()
+        if self.cache != None:
+            hcost = self.cache.get(board.zobrist)
+            if hcost != None:
+                self.no_cache_hits += 1
+                self.time_cost += time.perf_counter() - start
+                return hcost
+            self.no_cache_misses += 1
+        hcost = board.get_hcost()
+        if self.cache != None:
+            self.cache.put(board.zobrist, hcost)
+        self.time_cost += time.perf_counter() - start
+        self.no_cost_evaluations += 1
+        return hcost
+    def get_run_seeds(self, count=None):
+        """
+        This method gives the seed of every run (or of the given count of runs), spawned from self.seed (or a random one).
+        :param count:
+        :return:
+        """
+        base = get_master_seed(self.seed)
+        return [spawn_seed(base, i) for i in range(self.no_runs if count == None else count)]
+    def iter_runs(self, workers=None, profile=False, trace_memory=False, keep_records=True, checkpoint=None,
+                  resume=False, sink=None, **options):
+        """
+        This method runs all the boards, serially or spread over a process pool of the given size, and yields the
+        record of every run (seed, steps, restarts, final hcost, elapsed time, ...) in run order as soon as it is
+        done. The counters and self.stats are updated on the way. Each run is seeded on its own, so the merged
+        counters are the same either way. The pool is fed a few runs ahead of the one being yielded, so memory does
+        not grow with the number of runs, and without keep_records neither do the counters.
+        :param workers:
+        :param profile: True, or the indices of the runs to run under cProfile.
+        :param trace_memory: True, or the indices of the runs to run under tracemalloc.
+        :param keep_records: also keep the records and the plateau lengths in run_records and plateau_lengths.
+        :param checkpoint: a Checkpoint saved (when due) after every run and, for the serial restart variants, at
+        every restart of the run in progress; it is saved once more at the end.
+        :param resume: start from the checkpoint if it exists, with the counters, stats and seeds it holds. The
+        runs done after it was saved are done again, and give the same records.
+        :param sink: gets every run record through its write method before it is yielded, e.g. a JsonlSink. It is
+        flushed before every checkpoint save, so its file holds the records of all the runs the checkpoint counts
+        and, on resume, the records written after the checkpoint are dropped from it (see JsonlSink.truncate).
+        :param options: passed to the variant, e.g. limit_sideway; a sideways limit of 'adaptive' is passed as one
+        SidewayBudget shared by all the runs, which are then run serially and checkpointed with it.
+        :return:
+        """
+        run_options = get_variant_options(self.variant, options)
+        limit_option = get_variant(self.variant).limit_option
+        budget = run_options[limit_option] if isinstance(run_options.get(limit_option), SidewayBudget) else None
+        if budget != None and workers and workers > 1:
+            raise ValueError('an adaptive sideways limit learns from the runs in order, it needs workers=1, not %d'
+                             % workers)
+        first_run, in_progress = 0, None
+        if checkpoint != None and resume:
+            state = checkpoint.load()
+            if state != None:
+                self.restore_checkpoint_state(state, options)
+                first_run, in_progress = state['next_run'], state['in_progress']
+                if budget != None and state.get('budget') != None:
+                    budget = run_options[limit_option] = state['budget']
+            if sink != None:
+                sink.truncate(first_run)
+        base = get_master_seed(self.seed)
+        get_state = functools.partial(self.get_checkpoint_state, base, options, sink, budget)
+        if workers and workers > 1:
+            initargs = (self.cache.max_size, self.cache.eviction) if self.cache != None else (0, None)
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker_cache, initargs=initargs) as executor:
+                jobs = deque()
+                for i in range(first_run, self.no_runs):
+                    jobs.append(executor.submit(run_board, self.n, self.variant, spawn_seed(base, i), i, self.trace.level,
+                                                hooks=get_hooks(profile, trace_memory, i), model=self.model,
+                                                **run_options))
+                    if len(jobs) >= 4*workers:
+                        yield self.add_run(jobs.popleft().result(), keep_records, checkpoint, get_state, sink)
+                while jobs:
+                    yield self.add_run(jobs.popleft().result(), keep_records, checkpoint, get_state, sink)
+        else:
+            for i in range(first_run, self.no_runs):
+                run_checkpoint = None
+                if checkpoint != None:
+                    run_checkpoint = (checkpoint, functools.partial(get_state, i))
+                resume_run = in_progress if in_progress != None and in_progress['run'] == i else None
+                yield self.add_run(run_board(self.n, self.variant, spawn_seed(base, i), i, self.trace.level, trace=self.trace,
+                                             hooks=get_hooks(profile, trace_memory, i), model=self.model,
+                                             cache=self.cache, checkpoint=run_checkpoint, resume=resume_run,
+                                             **run_options),
+                                   keep_records, checkpoint, get_state, sink)
+        if sink != None:
+            sink.flush()
+        if checkpoint != None:
+            checkpoint.save(get_state(self.no_runs))
+    def add_run(self, counters, keep_records=True, checkpoint=None, get_state=None, sink=None):
+        """
+        This method merges the counters of a finished run, writes its record to the sink, saves the checkpoint if it
+        is due and gives the record.
+        :param counters:
+        :param keep_records:
+        :param checkpoint:
+        :param get_state: gives the checkpoint state from the index of the next run.
+        :param sink:
+        :return:
+        """
+        record = counters['run_records'][0]
+        if not keep_records:
+            counters = dict(counters, run_records=[], plateau_lengths=[])
+        self.merge_counters(counters)
+        self.stats.add(record)
+        if sink != None:
+            sink.write(record)
+        if checkpoint != None:
+            checkpoint.save_if_due(functools.partial(get_state, record['run'] + 1))
+        return record
+    def get_checkpoint_state(self, seed, options, sink, budget, next_run, in_progress=None):
+        """
+        This method gives the state saved in a checkpoint: the configuration of the batch, the index of the next
+        run, the counters and stats of the runs done so far, and the run in progress if any (its RNG state,
+        board, counters and steps/restarts so far), with the SidewayBudget of an adaptive limit and its plateaus.
+        The sink, if any, is flushed first, so that its file holds the records of the runs before next_run when the
+        checkpoint is saved.
+        :param seed: base seed of the runs.
+        :param options:
+        :param sink:
+        :param budget: the SidewayBudget of the runs, or None.
+        :param next_run:
+        :param in_progress:
+        :return:
+        """
+        if sink != None:
+            sink.flush()
+        return {'config': {'n': self.n, 'variant': self.variant, 'model': self.model, 'seed': seed, 'options': options},
+                'next_run': next_run, 'counters': self.get_counters(), 'stats': self.stats,
+                'in_progress': in_progress, 'budget': budget}
+    def restore_checkpoint_state(self, state, options):
+        """
+        This method takes back the counters, stats and seed of a checkpoint, after checking it was made for the
+        same batch.
+        :param state:
+        :param options:
+        :return:
+        """
+        config = state['config']
+        expected = {'n': self.n, 'variant': self.variant, 'model': self.model, 'options': options}
+        for key, value in expected.items():
+            if config[key] != value:
+                raise ValueError('checkpoint was made with %s=%r, not %r' % (key, config[key], value))
+        if self.seed != None and self.seed != config['seed']:
+            raise ValueError('checkpoint was made with seed=%r, not %r' % (config['seed'], self.seed))
+        self.seed = config['seed']
+        self.merge_counters(state['counters'])
+        self.stats = state['stats']
+    def run(self, workers=None, profile=False, trace_memory=False, sink=None, keep_records=True, checkpoint=None,
+            resume=False, **options):
+        """
+        This method runs all the boards (see iter_runs) and writes the summary trace at the end.
+        :param workers:
+        :param profile:
+        :param trace_memory:
+        :param sink: gets every run record as soon as the run is done (see iter_runs).
+        :param keep_records:
+        :param checkpoint:
+        :param resume:
+        :param options: passed to the variant, e.g. limit_sideway.
+        :return:
+        """
+        for record in self.iter_runs(workers, profile, trace_memory, keep_records, checkpoint, resume, sink, **options):
+            pass
+        self.trace.write('summary', *self.get_summary())
+        self.trace.flush()
+    def get_summary(self):
+        """
+        This method gives the summary lines of the runs done so far.
+        :return:
+        """
+        nr, ns = self.no_runs, self.no_success
+        return ['No of Total Runs: {}'.format(nr),
+                'Success Rate: {:.2f} %'.format((ns/nr)*100 if nr != 0 else 0),
+                'Avg steps: {:.2f} '.format(self.no_total_steps/nr if nr != 0 else 0),
+                'Avg random restart: {:.2f} '.format(self.no_random_restart/nr if nr != 0 else 0),
+                'Neighbors evaluated: {} ({:.3f} s in get_best_move)'.format(self.no_neighbors, self.time_best_neighbor),
+                'Cost evaluations: {} ({:.3f} s)'.format(self.no_cost_evaluations, self.time_cost),
+                'Sideways moves: {} over {} plateaus'.format(self.no_sideway_moves, self.no_plateaus),
+                'Tabu list: {} revisits avoided, {} neighbor evaluations saved, {} rescans'.format(
+                    self.no_tabu_avoided, self.no_tabu_saved, self.no_tabu_rescans),
+                'Cost cache: {} hits, {} misses'.format(self.no_cache_hits, self.no_cache_misses),
+                'Final hcost: mean {mean:.2f}, max {max}'.format(**self.stats.fields['hcost'].get_stats()),
+                'Elapsed per run: mean {mean:.4f} s, std {std:.4f} s'.format(**self.stats.fields['elapsed'].get_stats())]
+    def run_portfolio(self, k, limits=None, poll=1.0, **options):
+        """
+        This method runs k independent restart chains at the same time, one process each, on a single
+        problem. The first chain to reach hcost 0 wins and the other ones are cancelled.
+        Chain i uses limits[i % len(limits)] as its sideways limit when limits is given. A chain process that dies
+        without a record raises a RuntimeError (checked every poll seconds) and the other chains are terminated.
+        :param k:
+        :param limits:
+        :param poll:
+        :param options: passed to the variant.
+        :return: wall time, winning chain and the work done over all the chains.
+        """
+        variant = get_variant(self.variant)
+        if not variant.restarts:
+            raise ValueError('portfolio mode needs a random restart variant, got %r' % (self.variant,))
+        seeds = self.get_run_seeds(count=k)
+        stop_event = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        start = time.time()
+        chains = []
+        for i in range(k):
+            chain_options = dict(options, model=self.model)
+            if limits and variant.limit_option:
+                chain_options[variant.limit_option] = limits[i % len(limits)]
+            chains.append(multiprocessing.Process(target=run_chain, args=(self.n, self.variant, seeds[i], i, stop_event, results),
+                                                  kwargs=chain_options))
+        for chain in chains:
+            chain.start()
+        records = []
+        try:
+            while len(records) < k:
+                try:
+                    records.append(results.get(timeout=poll))
+                except queue.Empty:
+                    done = set(record['chain'] for record in records)
+                    for i, chain in enumerate(chains):
+                        if i not in done and chain.exitcode not in (None, 0):
+                            raise RuntimeError('portfolio chain %d exited with code %s' % (i, chain.exitcode))
+        finally:
+            stop_event.set()
+            for chain in chains:
+                if len(records) < k:
+                    chain.terminate()
+                chain.join()
+        winners = [record for record in records if record['success']]
+        return {
+            'wall_time': time.time() - start,
+            'winning_chain': winners[0]['chain'] if winners else None,
+            'total_steps': sum(record['steps'] for record in records),
+            'total_restarts': sum(record['restarts'] for record in records),
+            'chains': sorted(records, key=lambda record: record['chain']),
+        }
+    def get_best_move(self, board, allow_sideway=False, tabu=None):
+        """
+        This method gives the best move of the board based on the strategy, without making it: the variants make
+        it in place with apply_move, so no board is built per step.
+        With a tabu deque, a sideways move putting a queen back on a recently vacated cell is not taken: the
+        neighborhood is scanned again without the tabu cells (counted in no_tabu_rescans, the cost of the list), and
+        the cells the accepted move leaves are appended. A tabu move replaced by another one is counted in
+        no_tabu_avoided, and the neighborhood scan the search would have spent on the board it went back to in
+        no_tabu_saved. An improving tabu move is still taken, and so is the best tabu move when every other move
+        would raise the hcost, so the tabu list never ends a plateau on its own.
+        :param board:
+        :param allow_sideway: also accept a move keeping the hcost, picked at random among the best ones.
+        :param tabu:
+        :return: the move and its delta, or None and None if no move is accepted.
+        """
+        start = time.perf_counter()
+        self.no_neighbors += board.get_neighborhood_size()
+        delta, move = board.get_best_move(random_tie=allow_sideway, rng=self.rng)
+        if tabu and move and delta == 0 and board.is_tabu(move, tabu):
+            self.no_tabu_rescans += 1
+            self.no_neighbors += board.get_neighborhood_size()
+            tabu_delta, tabu_move = delta, move
+            delta, move = board.get_best_move(random_tie=allow_sideway, tabu=set(tabu), rng=self.rng)
+            if move == None or delta > 0:
+                delta, move = tabu_delta, tabu_move
+            else:
+                self.no_tabu_avoided += 1
+                self.no_tabu_saved += board.get_neighborhood_size()
+        if move and (delta < 0 or (allow_sideway and delta == 0)):
+            if tabu != None:
+                tabu.extend(board.get_vacated_cells(move))
+        else:
+            move, delta = None, None
+        self.time_best_neighbor += time.perf_counter() - start
+        return move, delta
+    def get_beam_successors(self, beam, beam_width):
+        """
+        This method pools the moves of all the boards of the beam and gives the beam_width best distinct successors,
+        best first. Every board scores all its moves in one vectorised pass (get_move_deltas), the pool holds the
+        hcost each move leads to and a partial selection picks the best ones, so only the kept moves are made on
+        copies. A successor whose Zobrist hash was already kept is dropped.
+        :param beam:
+        :param beam_width:
+        :return:
+        """
+        start = time.perf_counter()
+        invalid = 1 << 62
+        pool, offsets, size = [], [], 0
+        for board in beam:
+            deltas = board.get_move_deltas()
+            self.no_neighbors += board.get_neighborhood_size()
+            hcost = int(board.hcost)
+            if np != None:
+                deltas[deltas >= 8*self.n] = invalid - hcost
+                deltas += hcost
+                pool.append(deltas)
+            else:
+                pool.extend(invalid if delta >= 8*self.n else delta + hcost for delta in deltas)
+            offsets.append(size)
+            size += len(deltas)
+        if np != None:
+            pool = np.concatenate(pool) if pool else np.zeros(0, dtype=np.int64)
+        m = 2*beam_width
+        while True:
+            kept, seen = [], set(board.zobrist for board in beam)
+            for index in get_smallest(pool, m):
+                if pool[index] >= invalid:
+                    break
+                b = bisect_right(offsets, index) - 1
+                move = beam[b].get_move(index - offsets[b])
+                zobrist = beam[b].move_zobrist(move[0], move[1])
+                if zobrist in seen:
+                    continue
+                seen.add(zobrist)
+                kept.append((b, move, int(pool[index])))
+                if len(kept) == beam_width:
+                    break
+            if len(kept) == beam_width or m >= size:
+                break
+            m *= 4
+        successors = [beam[b].get_neighbor(move[0], move[1], hcost - beam[b].hcost) for b, move, hcost in kept]
+        self.time_best_neighbor += time.perf_counter() - start
+        return successors
+    def get_random_move(self, board, conflicted=False):
+        """
+        This method draws a random move of the board and scores it with move_delta in constant time.
+        :param board:
+        :param conflicted: draw the moving queen among the conflicted ones.
+        :return: the move (or None) and its hcost delta.
+        """
+        self.no_neighbors += 1
+        move = board.get_random_move(self.rng, conflicted)
+        if move == None:
+            return None, 0
+        return move, board.move_delta(move[0], move[1])
+    def get_min_conflicts_move(self, board, first_improvement=False):
+        """
+        This method picks a random conflicted queen and gives its least-conflicted move (staying put counts as one
+        of the candidates). On a free board the queen may go to any empty cell of its own row or column, on a
+        permutation board it may swap with any other row, so a step costs O(n) instead of a full neighborhood scan:
+        the queen is drawn from the conflicted set of the board in O(1) and its candidates are scored in one pass
+        (get_queen_move_deltas). A tie is drawn as the k-th tied candidate, k = rng.randrange(ties), the same with
+        or without NumPy. With first_improvement the first candidate lowering the hcost from a random start is
+        taken instead of the least-conflicted one.
+        :param board:
+        :param first_improvement:
+        :return: the move (or None) and its hcost delta.
+        """
+        start = time.perf_counter()
+        src = board.get_random_queen(self.rng, conflicted=True)
+        if src == None:
+            self.time_best_neighbor += time.perf_counter() - start
+            return None, 0
+        deltas = board.get_queen_move_deltas(src)
+        self.no_neighbors += len(deltas)
+        index = get_min_conflicts_index(deltas, first_improvement, self.rng)
+        self.time_best_neighbor += time.perf_counter() - start
+        if index == None:
+            return None, 0
+        return board.get_queen_move(src, index), int(deltas[index])
+    def hill_climbing(self, variant=None, board=None, **options):
+        """
+        This method runs the hill climbing algorithm based on the variant.
+        :param variant: name of a registered variant, defaults to self.variant.
+        :param board:
+        :param options: passed to the variant.
+        :return: the board the variant ended on.
+        """
+        hill_climb = get_variant(variant if variant != None else self.variant)
+        if board:
+            return hill_climb(self, board, **options)
+
+def get_smallest(values, m):
+    """
+    This function gives the indices of the m smallest values in increasing order, ties in index order, with a
+    partial selection (np.partition, or a heap for a list) instead of a full sort.
+    :param values: a NumPy array or a list.
+    :param m:
+    :return:
+    """
+    if np != None and isinstance(values, np.ndarray):
+        if m < len(values):
+            index = np.flatnonzero(values <= np.partition(values, m-1)[m-1])
+        else:
+            index = np.arange(len(values))
+        return index[np.argsort(values[index], kind='stable')][:m].tolist()
+    return heapq.nsmallest(m, range(len(values)), key=values.__getitem__)
+
+def get_min_conflicts_index(deltas, first_improvement, rng):
+    """
+    This function picks the candidate of get_min_conflicts_move from the deltas of the candidates (a NumPy array
+    or a list, invalid ones positive). Staying put is one more candidate of delta 0, counted after the others.
+    With first_improvement, the first negative delta from a random start (wrapping around) is taken if any.
+    :param deltas:
+    :param first_improvement:
+    :param rng:
+    :return: the index of the candidate, or None to stay put.
+    """
+    numpy = np != None and isinstance(deltas, np.ndarray)
+    if first_improvement:
+        first = rng.randrange(len(deltas))
+        if numpy:
+            improving = np.flatnonzero(deltas < 0)
+            if len(improving):
+                k = np.searchsorted(improving, first)
+                return int(improving[k] if k < len(improving) else improving[0])
+        else:
+            for t in range(len(deltas)):
+                index = (first + t) % len(deltas)
+                if deltas[index] < 0:
+                    return index
+        best = 0
+    else:
+        best = min(0, int(deltas.min()) if numpy else min(deltas))
+    if numpy:
+        tied = np.flatnonzero(deltas == best)
+    else:
+        tied = [index for index, delta in enumerate(deltas) if delta == best]
+    k = rng.randrange(len(tied) + (best == 0))
+    return int(tied[k]) if k < len(tied) else None
+
+def is_selected(flag, i):
+    """
+    This function checks whether a per-run hook given as True/False or as a collection of run indices is on for run i.
+    :param flag:
+    :param i:
+    :return:
+    """
+    if flag is True or flag is False or flag == None:
+        return bool(flag)
+    return i in flag
+
+def get_hooks(profile, trace_memory, i):
+    """
+    This function gives the hooks of run i for run_board.
+    :param profile:
+    :param trace_memory:
+    :param i:
+    :return:
+    """
+    return {'profile': is_selected(profile, i), 'trace_memory': is_selected(trace_memory, i)}
+
+worker_cache = None
+
+def init_worker_cache(cache_size, eviction):
+    """
+    This function sets up the cost cache shared by all the runs done in a worker process.
+    :param cache_size: 0 for no cache.
+    :param eviction:
+    :return:
+    """
+    global worker_cache
+    worker_cache = CostCache(cache_size, eviction) if cache_size else None
+
+def run_board(n, variant, seed, i, trace_level='none', trace=None, hooks=None, model='free', cache=None,
+              checkpoint=None, resume=None, **options):
+    """
+    This function runs the i-th board of a batch in a fresh NQueen drawing from the stream of seed, so that it can
+    also be sent to a worker process and follows the same trajectory either way.
+    A worker traces to its own stdout at trace_level, the serial loop passes its own trace. The cost cache is the
+    given one, or the one of the worker process.
+    hooks can turn on cProfile ('profile') and tracemalloc ('trace_memory') for this run, their output goes
+    into the run record.
+    checkpoint is a (Checkpoint, get_state) pair: when a save is due at a restart, get_state(in_progress) gives
+    the state to save. resume is the in_progress part of a checkpoint, the run then goes on from it.
+    :return: counters of this single run, with its record in run_records.
+    """
+    hooks = hooks if hooks != None else {}
+    nq = NQueen(no_runs=1, n=n, variant=variant, seed=seed, trace_level=trace_level, model=model)
+    if trace != None:
+        nq.trace = trace
+    nq.cache = cache if cache != None else worker_cache
+    nq.trace.write('per-run', '', '==========     BOARD :%s    =========='%(i,))
+    if hooks.get('trace_memory'):
+        tracemalloc.start()
+    if hooks.get('profile'):
+        profiler = cProfile.Profile()
+        profiler.enable()
+    start = time.perf_counter()
+    if checkpoint != None:
+        def on_restart(board, steps, restarts):
+            if checkpoint[0].is_due():
+                checkpoint[0].save(checkpoint[1]({'run': i, 'random_state': nq.rng.getstate(), 'board': board,
+                                                  'steps': steps, 'restarts': restarts, 'counters': nq.get_counters(),
+                                                  'elapsed': time.perf_counter() - start}))
+        nq.on_restart = on_restart
+    if resume != None:
+        nq.rng.setstate(resume['random_state'])
+        nq.merge_counters(resume['counters'])
+        start -= resume['elapsed']
+        b = resume['board']
+        options = dict(options, steps_done=resume['steps'], restarts_done=resume['restarts'])
+    else:
+        b = nq.new_board()
+    b = nq.hill_climbing(variant=variant, board=b, **options)
+    elapsed = time.perf_counter() - start
+    record = {'run': i, 'seed': seed, 'n': n, 'variant': variant, 'model': model, 'success': nq.no_success == 1,
+              'steps': nq.no_total_steps, 'restarts': nq.no_random_restart, 'hcost': b.hcost,
+              'neighbors': nq.no_neighbors,
+              'cost_evaluations': nq.no_cost_evaluations, 'sideway_moves': nq.no_sideway_moves,
+              'tabu_avoided': nq.no_tabu_avoided, 'tabu_saved': nq.no_tabu_saved, 'tabu_rescans': nq.no_tabu_rescans,
+              'cache_hits': nq.no_cache_hits, 'cache_misses': nq.no_cache_misses,
+              'plateau_lengths': list(nq.plateau_lengths), 'time_best_neighbor': nq.time_best_neighbor,
+              'time_cost': nq.time_cost, 'elapsed': elapsed}
+    if hooks.get('profile'):
+        profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(20)
+        record['profile'] = stream.getvalue()
+    if hooks.get('trace_memory'):
+        record['peak_memory_kb'] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    nq.run_records.append(record)
+    if trace == None:
+        nq.trace.flush()
+    return nq.get_counters()
+
+def run_chain(n, variant, seed, chain, stop_event, results, model='free', **options):
+    """
+    This function runs one restart chain of a portfolio until it solves the board or another chain does,
+    and puts its record on the results queue.
+    :return:
+    """
+    nq = NQueen(no_runs=1, n=n, variant=variant, seed=seed, model=model)
+    nq.stop_event = stop_event
+    options = get_variant_options(variant, options)
+    start = time.time()
+    nq.hill_climbing(variant=variant, board=nq.new_board(), **options)
+    if nq.no_success:
+        stop_event.set()
+    results.put({'chain': chain, 'seed': seed, 'success': nq.no_success == 1, 'steps': nq.no_total_steps,
+                 'restarts': nq.no_random_restart, 'elapsed': time.time() - start})
@@ -0,0 +1,49 @@
+"""
+    Trace output of the search, kept out of the hot loop unless asked for.
+    author: Jawad Chowdhury.
+"""
+import sys
+
+TRACE_LEVELS = ('none', 'summary', 'per-run', 'per-step')
+
+class Trace:
+    """
+    This class collects the trace of the search at a given level and writes it to a buffered sink.
+    Items are only formatted (with str) when their level is enabled, and they are joined and written
+    once the buffer holds buffer_size characters, or on flush.
+    """
+    def __init__(self, level='none', sink=None, buffer_size=1 << 16):
+        if level not in TRACE_LEVELS:
+            raise ValueError('unknown trace level %r, expected one of: %s' % (level, ', '.join(TRACE_LEVELS)))
+        self.level = level
+        self.rank = TRACE_LEVELS.index(level)
+        self.sink = sink
+        self.buffer = []
+        self.buffered = 0
+        self.buffer_size = buffer_size
+    def write(self, level, *items):
+        """
+        This method traces the items, one per line like print, if their level is enabled.
+        :param level:
+        :param items:
+        :return:
+        """
+        if self.rank < TRACE_LEVELS.index(level):
+            return
+        for item in items:
+            line = str(item)
+            self.buffer.append(line)
+            self.buffered += len(line) + 1
+        if self.buffered >= self.buffer_size:
+            self.flush()
+    def flush(self):
+        """
+        This method writes out the buffered lines.
+        :return:
+        """
+        if self.buffer:
+            sink = self.sink if self.sink != None else sys.stdout
+            sink.write('\n'.join(self.buffer) + '\n')
+            sink.flush()
+            self.buffer = []
+            self.buffered = 0
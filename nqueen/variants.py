@@ -0,0 +1,452 @@
+"""
+    Registry of the hill climbing variants. A variant is a function (nq, board, **options) that climbs from
+    board, adds its result to the counters of nq and gives the board it ended on.
+    author: Jawad Chowdhury.
+"""
+import math
+from collections import deque
+from nqueen.budget import SidewayBudget, get_limit_option, get_sideway_limit
+
+VARIANTS = {}
+
+def register_variant(name, restarts=False, limit_option=None, adaptive=False):
+    """
+    This function registers a variant under the given name.
+    :param name:
+    :param restarts: the variant restarts from new random boards until it finds a solution.
+    :param limit_option: name of the option holding the sideways limit of the variant, if any.
+    :param adaptive: the limit option may be 'adaptive', the variant then takes a SidewayBudget.
+    :return:
+    """
+    def register(function):
+        function.restarts = restarts
+        function.limit_option = limit_option
+        function.adaptive = adaptive
+        VARIANTS[name] = function
+        return function
+    return register
+
+def get_variant(name):
+    """
+    This function gives the registered variant with the given name.
+    :param name:
+    :return:
+    """
+    if name not in VARIANTS:
+        raise ValueError('unknown variant %r, expected one of: %s' % (name, ', '.join(sorted(VARIANTS))))
+    return VARIANTS[name]
+
+def get_variant_options(name, options):
+    """
+    This function gives the options of a run of the variant, with its sideways limit made a SidewayBudget if it
+    is 'adaptive', which only the variants registered with adaptive=True take.
+    :param name:
+    :param options:
+    :return:
+    """
+    limit_option = get_variant(name).limit_option
+    options = dict(options)
+    if limit_option in options:
+        if options[limit_option] == 'adaptive' and not get_variant(name).adaptive:
+            raise ValueError('variant %r takes no adaptive sideways limit, only %s do'
+                             % (name, ', '.join(sorted(v for v in VARIANTS if VARIANTS[v].adaptive))))
+        options[limit_option] = get_limit_option(options[limit_option])
+    return options
+
+def end_plateau(nq, limit, length, given_up):
+    """
+    This function records a plateau of the sideways variants in the counters of nq and, for an adaptive limit,
+    in its SidewayBudget.
+    """
+    nq.plateau_lengths.append(length)
+    nq.no_plateaus += 1
+    if isinstance(limit, SidewayBudget):
+        limit.add_plateau(length, not given_up)
+
+@register_variant('basic')
+def basic(nq, board):
+    """
+    Steepest ascent, stops as soon as no neighbor is strictly better. The board is moved in place.
+    """
+    current_board = board
+    no_local_steps = 0
+    while True:
+        nq.trace.write('per-step', current_board)
+        move, delta = nq.get_best_move(current_board)
+        if move == None:
+            break
+        no_local_steps += 1
+        current_board.apply_move(move[0], move[1], delta)
+    nq.trace.write('per-run', current_board)
+    if current_board.hcost != 0:
+        nq.trace.write('per-run', 'SOLUTION NOT FOUND!!!')
+        nq.no_total_steps += no_local_steps
+    else:
+        nq.trace.write('per-run', 'SOLUTION FOUND!!!')
+        nq.no_success += 1
+        nq.no_success_steps += no_local_steps
+        nq.no_total_steps += no_local_steps
+    return current_board
+
+@register_variant('sideway', limit_option='limit_sideway', adaptive=True)
+def sideway(nq, board, limit_sideway=100, tabu_size=0):
+    """
+    Steepest ascent that allows up to limit_sideway sideways moves on a plateau, limit_sideway being an int or a
+    SidewayBudget giving the limit of every plateau. With tabu_size, a sideways move may not put a queen back on
+    one of the last tabu_size cells vacated on the current plateau.
+    """
+    current_board = board
+    no_local_steps = 0
+    while current_board.hcost != 0:
+        nq.trace.write('per-step', current_board)
+        move, delta = nq.get_best_move(current_board, allow_sideway=False)
+        if move != None:
+            current_board.apply_move(move[0], move[1], delta)
+            no_local_steps += 1
+        else:
+            counter_sideway = 0
+            limit = get_sideway_limit(limit_sideway, nq.n, no_local_steps)
+            tabu = deque(maxlen=tabu_size) if tabu_size else None
+            updated = True
+            while (move == None or delta == 0) and counter_sideway <=limit:
+                nq.trace.write('per-step', current_board)
+                if move != None:
+                    current_board.apply_move(move[0], move[1], delta)
+                no_local_steps += 1
+                counter_sideway +=1
+                nq.no_sideway_moves += 1
+                move, delta = nq.get_best_move(current_board, allow_sideway=True, tabu=tabu)
+                updated = move != None
+                if not updated:
+                    break
+            end_plateau(nq, limit_sideway, counter_sideway, counter_sideway > limit or not updated)
+            if counter_sideway > limit or not updated:
+                break
+            current_board.apply_move(move[0], move[1], delta)
+    nq.trace.write('per-run', current_board)
+    if current_board.hcost != 0:
+        nq.trace.write('per-run', 'SOLUTION NOT FOUND!!!')
+        nq.no_total_steps += no_local_steps
+    else:
+        nq.trace.write('per-run', 'SOLUTION FOUND!!!')
+        nq.no_success += 1
+        nq.no_success_steps += no_local_steps
+        nq.no_total_steps += no_local_steps
+    return current_board
+
+@register_variant('random_restart_basic', restarts=True)
+def random_restart_basic(nq, board, steps_done=0, restarts_done=0):
+    """
+    Basic steepest ascent, restarted from a new random board until a solution is found.
+    steps_done and restarts_done are the steps and restarts of a resumed run before board.
+    """
+    current_board = board
+    no_local_restart = restarts_done
+    no_local_steps = steps_done
+    success = False
+    while not success:
+        while not nq.stopped():
+            nq.trace.write('per-step', current_board)
+            move, delta = nq.get_best_move(current_board)
+            if move == None:
+                break
+            no_local_steps += 1
+            current_board.apply_move(move[0], move[1], delta)
+        if nq.stopped():
+            break
+        nq.trace.write('per-run', current_board)
+        if current_board.hcost == 0:
+            success = True
+            nq.trace.write('per-run', 'SOLUTION FOUND')
+        else:
+            current_board = nq.new_board()
+            no_local_restart += 1
+            nq.trace.write('per-step', 'RESTARTING ...')
+            nq.restarted(current_board, no_local_steps, no_local_restart)
+    nq.no_random_restart += no_local_restart
+    nq.no_total_steps += no_local_steps
+    if success:
+        nq.no_success += 1
+        nq.no_success_steps += no_local_steps
+    return current_board
+
+@register_variant('random_restart_sideway', restarts=True, limit_option='limit_random_restart_sideway', adaptive=True)
+def random_restart_sideway(nq, board, limit_random_restart_sideway=100, tabu_size=0, steps_done=0, restarts_done=0):
+    """
+    Steepest ascent with sideways moves, restarted from a new random board until a solution is found.
+    limit_random_restart_sideway and tabu_size work as limit_sideway and tabu_size of sideway, steps_done and
+    restarts_done as for random_restart_basic.
+    """
+    current_board = board
+    no_local_restart = restarts_done
+    no_local_steps = steps_done
+    restart_steps = no_local_steps
+    success = False
+    while not success:
+        while current_board.hcost != 0 and not nq.stopped():
+            nq.trace.write('per-step', current_board)
+            move, delta = nq.get_best_move(current_board, allow_sideway=False)
+            if move != None:
+                current_board.apply_move(move[0], move[1], delta)
+                no_local_steps += 1
+            else:
+                counter_random_restart_sideway = 0
+                limit = get_sideway_limit(limit_random_restart_sideway, nq.n, no_local_steps - restart_steps)
+                tabu = deque(maxlen=tabu_size) if tabu_size else None
+                updated = True
+                while (move == None or delta == 0) and counter_random_restart_sideway <=limit \
+                        and not nq.stopped():
+                    nq.trace.write('per-step', current_board)
+                    if move != None:
+                        current_board.apply_move(move[0], move[1], delta)
+                    no_local_steps += 1
+                    counter_random_restart_sideway +=1
+                    nq.no_sideway_moves += 1
+                    move, delta = nq.get_best_move(current_board, allow_sideway=True, tabu=tabu)
+                    updated = move != None
+                    if not updated:
+                        break
+                end_plateau(nq, limit_random_restart_sideway, counter_random_restart_sideway,
+                            counter_random_restart_sideway > limit or not updated)
+                if counter_random_restart_sideway > limit or not updated:
+                    break
+                if move != None:
+                    current_board.apply_move(move[0], move[1], delta)
+        if current_board.hcost == 0 :
+            success = True
+            nq.trace.write('per-run', current_board, 'SOLUTION FOUND!!!')
+        elif nq.stopped():
+            break
+        else:
+            nq.trace.write('per-step', 'RESTARTING!!!')
+            no_local_restart+=1
+            restart_steps = no_local_steps
+            current_board = nq.new_board()
+            nq.restarted(current_board, no_local_steps, no_local_restart)
+    if success:
+        nq.no_success += 1
+        nq.no_success_steps += no_local_steps
+    nq.no_total_steps += no_local_steps
+    nq.no_random_restart += no_local_restart
+    return current_board
+
+@register_variant('min_conflicts')
+def min_conflicts(nq, board, limit_steps=None, first_improvement=False):
+    """
+    Min-conflicts: moves a random conflicted queen to its least-conflicted cell until hcost 0 or limit_steps.
+    The board is moved in place, and it is not traced on every step since this variant is meant for large n.
+    :param limit_steps: defaults to 100*n.
+    :param first_improvement:
+    """
+    if limit_steps == None:
+        limit_steps = 100*nq.n
+    current_board = board
+    no_local_steps = 0
+    while current_board.hcost != 0 and no_local_steps < limit_steps:
+        move, delta = nq.get_min_conflicts_move(current_board, first_improvement=first_improvement)
+        no_local_steps += 1
+        if move:
+            current_board.apply_move(move[0], move[1], delta)
+    nq.trace.write('per-run', 'hcost : %s' % (current_board.hcost,))
+    if current_board.hcost != 0:
+        nq.trace.write('per-run', 'SOLUTION NOT FOUND!!!')
+        nq.no_total_steps += no_local_steps
+    else:
+        nq.trace.write('per-run', 'SOLUTION FOUND!!!')
+        nq.no_success += 1
+        nq.no_success_steps += no_local_steps
+        nq.no_total_steps += no_local_steps
+    return current_board
+
+def cool_geometric(t0, t_min, k, limit_steps):
+    """
+    Geometric cooling, from t0 down to t_min over limit_steps steps.
+    """
+    return t0 * (t_min / t0) ** (k / limit_steps)
+
+def cool_linear(t0, t_min, k, limit_steps):
+    """
+    Linear cooling, from t0 down to t_min over limit_steps steps.
+    """
+    return t0 - (t0 - t_min) * k / limit_steps
+
+def cool_logarithmic(t0, t_min, k, limit_steps):
+    """
+    Logarithmic cooling t0 / ln(e + k), the slow schedule of the convergence proofs, kept above t_min.
+    """
+    return max(t_min, t0 / math.log(math.e + k))
+
+COOLING_SCHEDULES = {'geometric': cool_geometric, 'linear': cool_linear, 'logarithmic': cool_logarithmic}
+
+def get_limit_tries(board, sample_size=1):
+    """
+    This function gives the default number of draws (or samples of sample_size draws) in a row without a move
+    after which the sampling variants give up: four times the 2n row and column moves of every conflicted queen,
+    so a stuck board costs O(n) draws per conflicted queen.
+    """
+    return max(1, -(-8*board.n*len(board.conflicted) // sample_size))
+
+def end_sampled_run(nq, board, no_local_steps):
+    """
+    This function adds the result of a run of the sampling variants to the counters of nq.
+    """
+    nq.trace.write('per-run', 'hcost : %s' % (board.hcost,))
+    if board.hcost != 0:
+        nq.trace.write('per-run', 'SOLUTION NOT FOUND!!!')
+        nq.no_total_steps += no_local_steps
+    else:
+        nq.trace.write('per-run', 'SOLUTION FOUND!!!')
+        nq.no_success += 1
+        nq.no_success_steps += no_local_steps
+        nq.no_total_steps += no_local_steps
+    return board
+
+@register_variant('local_beam', limit_option='limit_sideway')
+def local_beam(nq, board, beam_width=8, limit_sideway=100):
+    """
+    Local beam search: keeps beam_width boards, board and beam_width-1 random ones, and replaces them on every
+    step with the beam_width best distinct successors of the whole beam. Stops when the best board is solved, or
+    once it went limit_sideway steps in a row without improving.
+    :param beam_width:
+    :param limit_sideway:
+    """
+    beam = [board] + [nq.new_board() for k in range(beam_width-1)]
+    current_board = min(beam, key=lambda b: b.hcost)
+    no_local_steps = 0
+    counter_sideway = 0
+    while current_board.hcost != 0:
+        nq.trace.write('per-step', current_board)
+        successors = nq.get_beam_successors(beam, beam_width)
+        if not successors:
+            break
+        if successors[0].hcost >= current_board.hcost:
+            if counter_sideway >= limit_sideway:
+                break
+            counter_sideway += 1
+            nq.no_sideway_moves += 1
+        else:
+            counter_sideway = 0
+        beam = successors
+        current_board = beam[0]
+        no_local_steps += 1
+    nq.trace.write('per-run', current_board)
+    if current_board.hcost != 0:
+        nq.trace.write('per-run', 'SOLUTION NOT FOUND!!!')
+        nq.no_total_steps += no_local_steps
+    else:
+        nq.trace.write('per-run', 'SOLUTION FOUND!!!')
+        nq.no_success += 1
+        nq.no_success_steps += no_local_steps
+        nq.no_total_steps += no_local_steps
+    return current_board
+
+@register_variant('first_choice', limit_option='limit_sideway')
+def first_choice(nq, board, limit_sideway=1000, limit_tries=None):
+    """
+    First-choice hill climbing: draws random moves of the conflicted queens (the only ones whose moves can lower
+    the hcost), scored in constant time, and takes the first one that lowers the hcost, or that keeps it while
+    fewer than limit_sideway sideways moves were taken in a row. Gives up after limit_tries draws in a row without
+    one. Moves are made in place, as in min_conflicts.
+    :param limit_sideway:
+    :param limit_tries: defaults to get_limit_tries of the board, 8n draws per conflicted queen.
+    """
+    current_board = board
+    no_local_steps = 0
+    counter_sideway = 0
+    tries = 0
+    limit = limit_tries if limit_tries != None else get_limit_tries(current_board)
+    while current_board.hcost != 0 and tries < limit:
+        move, delta = nq.get_random_move(current_board, conflicted=True)
+        if move == None:
+            break
+        tries += 1
+        if delta < 0 or (delta == 0 and counter_sideway < limit_sideway):
+            current_board.apply_move(move[0], move[1], delta)
+            no_local_steps += 1
+            tries = 0
+            limit = limit_tries if limit_tries != None else get_limit_tries(current_board)
+            if delta == 0:
+                counter_sideway += 1
+                nq.no_sideway_moves += 1
+            else:
+                counter_sideway = 0
+    return end_sampled_run(nq, current_board, no_local_steps)
+
+@register_variant('stochastic', limit_option='limit_sideway')
+def stochastic(nq, board, limit_sideway=1000, sample_size=None, limit_tries=None):
+    """
+    Stochastic hill climbing: draws sample_size random moves of the conflicted queens and takes one of the
+    improving ones at random, with a probability proportional to its gain. A sample without any takes one of its
+    sideways moves, while fewer than limit_sideway were taken in a row. Gives up after limit_tries samples in a
+    row without a move.
+    :param limit_sideway:
+    :param sample_size: defaults to n.
+    :param limit_tries: defaults to get_limit_tries of the board, as many draws as first_choice.
+    """
+    if sample_size == None:
+        sample_size = nq.n
+    current_board = board
+    no_local_steps = 0
+    counter_sideway = 0
+    tries = 0
+    limit = limit_tries if limit_tries != None else get_limit_tries(current_board, sample_size)
+    while current_board.hcost != 0 and tries < limit:
+        improving, sideway, gain = [], [], 0
+        for k in range(sample_size):
+            move, delta = nq.get_random_move(current_board, conflicted=True)
+            if move == None:
+                continue
+            if delta < 0:
+                improving.append((move, delta))
+                gain -= delta
+            elif delta == 0:
+                sideway.append(move)
+        tries += 1
+        if improving:
+            pick = nq.rng.randrange(gain)
+            for move, delta in improving:
+                pick += delta
+                if pick < 0:
+                    break
+            counter_sideway = 0
+        elif sideway and counter_sideway < limit_sideway:
+            move, delta = sideway[nq.rng.randrange(len(sideway))], 0
+            counter_sideway += 1
+            nq.no_sideway_moves += 1
+        else:
+            continue
+        current_board.apply_move(move[0], move[1], delta)
+        no_local_steps += 1
+        tries = 0
+        limit = limit_tries if limit_tries != None else get_limit_tries(current_board, sample_size)
+    return end_sampled_run(nq, current_board, no_local_steps)
+
+@register_variant('simulated_annealing')
+def simulated_annealing(nq, board, t0=0.5, t_min=0.05, cooling='geometric', limit_steps=None):
+    """
+    Simulated annealing: draws random moves of the conflicted queens, scored in constant time, and takes a move of
+    hcost delta with probability 1 if delta <= 0 and exp(-delta/T) otherwise. The temperature T goes from t0 down
+    to t_min over limit_steps draws following the cooling schedule, a name of COOLING_SCHEDULES or a function
+    (t0, t_min, k, limit_steps) -> T. Steps count the moves taken.
+    :param limit_steps: defaults to 500*n draws.
+    """
+    if limit_steps == None:
+        limit_steps = 500*nq.n
+    if not 0 < t_min <= t0:
+        raise ValueError('simulated_annealing needs 0 < t_min <= t0, got t_min=%r, t0=%r' % (t_min, t0))
+    if isinstance(cooling, str) and cooling not in COOLING_SCHEDULES:
+        raise ValueError('unknown cooling schedule %r, expected one of: %s' % (cooling, ', '.join(sorted(COOLING_SCHEDULES))))
+    schedule = COOLING_SCHEDULES[cooling] if isinstance(cooling, str) else cooling
+    current_board = board
+    no_local_steps = 0
+    k = 0
+    while current_board.hcost != 0 and k < limit_steps:
+        temperature = schedule(t0, t_min, k, limit_steps)
+        k += 1
+        move, delta = nq.get_random_move(current_board, conflicted=True)
+        if move == None:
+            break
+        if delta <= 0 or nq.rng.random() < math.exp(-delta / temperature):
+            current_board.apply_move(move[0], move[1], delta)
+            no_local_steps += 1
+    return end_sampled_run(nq, current_board, no_local_steps)
@@ -0,0 +1,32 @@
+"""
+    The best move of a board is the same with and without NumPy, tabu cells and random ties included.
+    author: Jawad Chowdhury.
+"""
+import random
+import pytest
+import nqueen.board
+from nqueen.board import BOARD_MODELS, np
+
+def get_best_moves(model, n, seed):
+    """
+    This function gives the best move of boards drawn from seed, plain, with random ties and with tabu cells.
+    :return:
+    """
+    rng = random.Random(seed)
+    moves = []
+    for _ in range(20):
+        board = BOARD_MODELS[model](n, rng=rng)
+        tabu = set((rng.randrange(n), rng.randrange(n)) for _ in range(rng.randrange(1, n)))
+        moves.append((board.hcost, sorted(board.get_queens())))
+        for random_tie in (False, True):
+            for cells in (None, tabu):
+                moves.append(board.get_best_move(random_tie=random_tie, tabu=cells, rng=rng))
+    return moves
+
+@pytest.mark.skipif(np == None, reason='compares the NumPy path with the pure Python one')
+@pytest.mark.parametrize('model', sorted(BOARD_MODELS))
+@pytest.mark.parametrize('n', [5, 8, 11])
+def test_best_move_without_numpy(monkeypatch, model, n):
+    expected = get_best_moves(model, n, n)
+    monkeypatch.setattr(nqueen.board, 'np', None)
+    assert get_best_moves(model, n, n) == expected
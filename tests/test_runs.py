@@ -0,0 +1,51 @@
+"""
+    The runs of a seeded batch are the same serially, in a process pool and in the batched engine.
+    author: Jawad Chowdhury.
+"""
+import pytest
+from nqueen import NQueen, BatchNQueen
+from nqueen.board import np
+from nqueen.variants import get_variant
+
+CASES = [('basic', 100), ('sideway', 20), ('random_restart_basic', 100), ('random_restart_sideway', 10)]
+
+def get_runs(variant, limit, workers=None):
+    """
+    This function runs the seeded batch of the variant with NQueen, serially or over workers processes.
+    :param variant:
+    :param limit: sideways limit, if the variant takes one.
+    :param workers:
+    :return:
+    """
+    limit_option = get_variant(variant).limit_option
+    nq = NQueen(no_runs=12, n=8, variant=variant, seed=7)
+    nq.run(workers=workers, **({limit_option: limit} if limit_option else {}))
+    return nq
+
+def get_records(records, keys=None):
+    """
+    This function gives the records without their timings, or with the given keys only.
+    :param records:
+    :param keys:
+    :return:
+    """
+    return [{k: v for k, v in record.items() if (k in keys if keys else not k.startswith('time') and k != 'elapsed')}
+            for record in records]
+
+@pytest.mark.parametrize('variant, limit', CASES)
+def test_pool_runs_match_serial_runs(variant, limit):
+    serial = get_runs(variant, limit)
+    pool = get_runs(variant, limit, workers=2)
+    assert get_records(pool.run_records) == get_records(serial.run_records)
+    assert pool.get_counters()['no_total_steps'] == serial.no_total_steps
+
+@pytest.mark.skipif(np == None, reason='BatchNQueen needs numpy')
+@pytest.mark.parametrize('variant, limit', CASES)
+def test_batch_runs_match_serial_runs(variant, limit):
+    serial = get_runs(variant, limit)
+    batch = BatchNQueen(no_runs=12, n=8, variant=variant, seed=7, batch_size=5, limit_sideway=limit)
+    batch.run()
+    keys = ('run', 'seed', 'success', 'steps', 'restarts', 'hcost')
+    assert sorted(get_records(batch.run_records, keys), key=lambda record: record['run']) \
+           == get_records(serial.run_records, keys)
+    assert batch.no_sideway_moves == serial.no_sideway_moves